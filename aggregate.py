@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+aggregate.py - single pass aggregation engine for BallAlysis
+
+Match events are flattened once (see events.py) into a DataFrame with
+categorical columns, then every counter of the match summary is computed
+by ONE grouped aggregation instead of re-filtering the events once per
+team and metric.
+
+The metric set is declarative : a counter is just a `Metric` saying which
+event type and which column values it counts, so adding offsides, saves
+or interceptions is one line in TEAM_METRICS and no new scan loop.
+Player counters work the same way (PLAYER_METRICS), grouped on the
+StatsBomb player id so two players sharing a name are never merged.
+
+Author: Tarik Ataia
+License: Free - Public - Open Source
+Version: 1.0
+"""
+
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+# name  : column name in the summary table
+# event : value of the "event" column to count (None = any event)
+# where : extra (column, value) pairs that must all match
+Metric = namedtuple("Metric", ["name", "event", "where"])
+
+
+def metric(name, event=None, **where):
+    """
+    Declare a counter, e.g. metric("Goals", event="Shot", outcome="Goal").
+    """
+    return Metric(name, event, tuple(where.items()))
+
+
+# counters of the match summary table, in display order
+TEAM_METRICS = [
+    metric("Shots", event="Shot"),
+    metric("Goals", event="Shot", outcome="Goal"),
+    metric("Passes", event="Pass"),
+    metric("Fouls", event="Foul Committed"),
+    metric("Corners", event="Pass", pass_type="Corner"),
+    metric("Yellow Cards", card_type="Yellow Card"),
+    metric("Red Cards", card_type="Red Card"),
+]
+
+# counters of the player statistics table, in display order
+PLAYER_METRICS = [
+    metric("Shots", event="Shot"),
+    metric("Goals", event="Shot", outcome="Goal"),
+    metric("Passes", event="Pass"),
+]
+
+
+def register_metric(registry, name, event=None, **where):
+    """
+    Add a counter to a metric registry (TEAM_METRICS, PLAYER_METRICS or
+    a copy of them), e.g. register_metric(PLAYER_METRICS, "Offsides", event="Offside").
+    """
+    m = metric(name, event, **where)
+    registry.append(m)
+    return m
+
+
+def metric_mask(df, m):
+    """Return a boolean numpy array of the rows counted by metric `m`."""
+    mask = np.ones(len(df), dtype=bool)
+    if m.event is not None:
+        mask &= (df["event"] == m.event).to_numpy()
+    for column, value in m.where:
+        mask &= (df[column] == value).to_numpy()
+    return mask
+
+
+def team_summary(df, metrics=TEAM_METRICS):
+    """
+    Compute every team counter of `metrics` in one grouped aggregation.
+    Returns a DataFrame indexed by team name (in order of appearance)
+    with one integer column per metric.
+    """
+    df = df.dropna(subset=["team"])
+    flags = pd.DataFrame({m.name: metric_mask(df, m) for m in metrics}, index=df.index)
+    stats_df = flags.groupby(df["team"], observed=True, sort=False).sum()
+    # plain team names as index, same shape as the original per-team loop
+    stats_df.index = stats_df.index.astype(object)
+    return stats_df.rename_axis(None).astype(int)
+
+
+def player_summary(df, metrics=PLAYER_METRICS):
+    """
+    Compute every player counter of `metrics` in one grouped aggregation
+    keyed on the player id. The player name (shortened to three words for
+    display) and team are joined afterwards from the first event of each
+    player. Sorted by team, then goals and shots (when counted).
+    """
+    df = df.dropna(subset=["player_id", "player", "team"])
+    flags = pd.DataFrame({m.name: metric_mask(df, m) for m in metrics}, index=df.index)
+    counters = flags.groupby(df["player_id"], observed=True, sort=False).sum()
+    # name and team of every player id, from its first event
+    names = df.groupby("player_id", observed=True, sort=False)[["player", "team"]].first()
+
+    stats_df = pd.DataFrame({
+        "player_id": counters.index.astype(object),
+        "player": [" ".join(name.split()[:3]) for name in names["player"].astype(object)],
+        "team": names["team"].astype(object).to_numpy(),
+    })
+    for m in metrics:
+        stats_df[m.name] = counters[m.name].to_numpy().astype(int)
+    # goals / shots only when the registry counts them
+    sort = ["team"] + [c for c in ("Goals", "Shots") if c in stats_df.columns]
+    stats_df = stats_df.sort_values(sort, ascending=[True] + [False] * (len(sort) - 1))
+    return stats_df.reset_index(drop=True)
+
+
+# columns of the season league table, in display order
+LEAGUE_COLUMNS = ["Played", "Won", "Drawn", "Lost", "GF", "GA", "GD", "Pts",
+                  "Shots", "Passes", "Yellow Cards", "Red Cards"]
+
+# match summary counters carried over to the league table
+LEAGUE_COUNTERS = ["Shots", "Passes", "Yellow Cards", "Red Cards"]
+
+
+def league_rows(match, stats_df):
+    """
+    Turn one match (catalog entry) and its summary table into two league
+    table rows, one per team. The score comes from the matches feed
+    (it includes own goals), or from the summary goals when it is missing.
+    """
+    home, away = match["home_team"], match["away_team"]
+    home_goals, away_goals = match.get("home_score"), match.get("away_score")
+    if home_goals is None or away_goals is None:
+        home_goals = stats_df.loc[home, "Goals"] if home in stats_df.index else 0
+        away_goals = stats_df.loc[away, "Goals"] if away in stats_df.index else 0
+
+    rows = []
+    for team, scored, conceded in ((home, home_goals, away_goals), (away, away_goals, home_goals)):
+        row = {
+            "team": team,
+            "Played": 1,
+            "Won": int(scored > conceded),
+            "Drawn": int(scored == conceded),
+            "Lost": int(scored < conceded),
+            "GF": int(scored),
+            "GA": int(conceded),
+        }
+        for counter in LEAGUE_COUNTERS:
+            has_counter = team in stats_df.index and counter in stats_df.columns
+            row[counter] = int(stats_df.loc[team, counter]) if has_counter else 0
+        rows.append(row)
+    return rows
+
+
+def league_table(rows):
+    """
+    Reduce league rows (see league_rows) into the season table,
+    sorted by points, goal difference and goals scored.
+    """
+    if not rows:
+        return pd.DataFrame(columns=LEAGUE_COLUMNS)
+    table = pd.DataFrame(rows).groupby("team").sum()
+    table["GD"] = table["GF"] - table["GA"]
+    table["Pts"] = 3 * table["Won"] + table["Drawn"]
+    table = table.sort_values(["Pts", "GD", "GF"], ascending=False, kind="stable")
+    table.index.name = None
+    return table[LEAGUE_COLUMNS]
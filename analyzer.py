@@ -5,340 +5,977 @@
 # Date: 19.10.2025
 
 # import necessary libraries
+import os
 import sys
-import time
-import pandas as pd  # for data manipulation
+import copy
+import numbers
+import json
 import requests  # for making HTTP requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import pandas as pd
 import colorama  # for colored terminal text
 from colorama import Fore, Style
+from cache import (HTTPCache, MemoryCache, DEFAULT_CACHE_DIR, DEFAULT_MEMORY_BUDGET,
+                   atomic_write_json)  # on-disk / in-memory caches
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from aggregate import (TEAM_METRICS, PLAYER_METRICS, team_summary, player_summary,
+                       league_rows, league_table)  # aggregation engine
+from events import read_events, as_frame, parse_event_files  # streaming events parser
+from catalog import CompetitionCatalog, MatchCatalog, normalize_name  # indexed competitions / matches of a season
+from store import EventStore  # columnar events saved per match
+from totals import SeasonTotals  # incrementally updated season aggregates
+from network import pass_networks  # passer -> recipient matrices
+from timeline import timeline  # time-bucketed counters
+from players import PlayerIndex  # player id -> per-match counters
+from spatial import DEFAULT_BINS, heatmaps, shot_map, spatial_arrays, save_npz  # pitch grids
+from mirror import get_mirror, mirror_root, open_path, path_source  # local compressed data mirror
+from instrument import Metrics  # per-stage timings and counters
 colorama.init(autoreset=True)  # initialize colorama
 
+# status codes worth retrying : rate limiting and server side errors
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def build_session(pool_size=10, retries=3, backoff=0.5):
+    """
+    Build a requests.Session with a pooled keep-alive HTTPAdapter,
+    gzip enabled and bounded retries with exponential backoff + jitter
+    for connection errors, 429 and 5xx answers.
+    """
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff,
+        backoff_jitter=backoff,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset(["GET", "HEAD"]),
+        respect_retry_after_header=True,
+        # give back the last response instead of raising,
+        # raise_for_status() turns it into a RequestException
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"Accept-Encoding": "gzip, deflate", "Connection": "keep-alive"})
+    return session
+
 
 class StatsAnalyzer:
     """
         This class handles fetching and analyzing football data
         from the StatsBomb Open Data API.
     """
-    def __init__(self, base_url='', season="2018/2019"):
+    def __init__(self, base_url='', season="2018/2019", cache_dir=DEFAULT_CACHE_DIR, offline=False,
+                 pool_size=10, retries=3, backoff=0.5, timeout=10, quiet=False, metrics=False,
+                 competition="La Liga", memory_budget=DEFAULT_MEMORY_BUDGET, memory_ttl=None):
         self.base_url = base_url
+        # base_url="mirror:///path" (see mirror.py) reads every file from a
+        # local compressed mirror, without any network access
+        root = mirror_root(base_url)
+        self.mirror = get_mirror(root) if root else None
+        # any competition of competitions.json (name, fuzzy name or id)
+        self.competition = competition
         self.season = season
+        # the analyzer never prompts, it only reports on stderr (unless quiet)
+        self.quiet = quiet
         # competition id and season id :
         # will be set based on returned data from competitions.json
         self.competition_id = None
         self.season_id = None
+        # downloaded files are kept on disk and re-used on the next run,
+        # cache_dir=None turns the cache off (offline mode needs the cache)
+        if offline and not cache_dir and self.mirror is None:
+            raise ValueError("offline mode needs a cache_dir (or a mirror base_url)")
+        self.cache = HTTPCache(cache_dir, offline=offline) if cache_dir else None
+        # parsed matches (EventTables) kept in memory, least recently used
+        # out past `memory_budget` bytes (0 turns it off), see memory_stats()
+        self.memory = MemoryCache(max_bytes=memory_budget, ttl=memory_ttl)
+        # one pooled session for every request : connections (and their
+        # TLS handshakes) are re-used instead of opened for each file
+        self.timeout = timeout
+        self.session = build_session(pool_size=pool_size, retries=retries, backoff=backoff)
+        # counters of the match summary table, see aggregate.TEAM_METRICS
+        self.team_metrics = list(TEAM_METRICS)
+        # counters of the player statistics table, see aggregate.PLAYER_METRICS
+        self.player_metrics = list(PLAYER_METRICS)
+        # CompetitionCatalog of competitions.json, see competition_catalog()
+        self._competitions = None
+        # MatchCatalog per (competition_id, season_id), see match_catalog()
+        self._catalogs = {}
+        # EventStore per (competition_id, season_id), see event_store()
+        self._stores = {}
+        # PlayerIndex (loaded on first use), see player_index()
+        self._indexes = {}
+        # head-to-head results per normalized team pair, see head_to_head()
+        self._head_to_head_results = {}
+        # per-stage timings and counters : metrics=True or a Metrics object,
+        # disabled by default (near zero overhead)
+        self.metrics = metrics if isinstance(metrics, Metrics) else Metrics(enabled=bool(metrics))
+        self.metrics.register_gauge("cache", self.cache_stats)
+        self.metrics.register_gauge("memory", self.memory_stats)
+
+    def log(self, message, color=""):
+        """
+        Report progress and errors on stderr (stdout is left to the data),
+        silenced with quiet=True.
+        """
+        if not self.quiet:
+            print(color + message + Style.RESET_ALL, file=sys.stderr)
+
+    def fetch_file(self, url, revalidate=False):
+        """
+        Return the local path of the cached copy of `url`.
+        Fresh entries are served from disk, older ones are revalidated
+        with a conditional request and only downloaded again if they changed.
+        revalidate=True revalidates even a fresh entry.
+        Returns None if the file is not available.
+        """
+        with self.metrics.stage("fetch"):
+            if self.mirror is not None:
+                path = self.mirror.path(self.mirror_name(url))
+                if path is None:
+                    self.log(f"[-] {url} is not in the mirror.", Fore.RED)
+                return path
+            return self._fetch_file(url, revalidate)
+
+    def mirror_name(self, url):
+        """Path of `url` inside the data/ tree ("events/123.json")."""
+        return url[len(self.base_url):].lstrip("/")
+
+    def local_source(self, url):
+        """
+        Content hash of the local copy of `url` (mirror or cache),
+        None if there is none. No network access.
+        """
+        if self.mirror is not None:
+            return self.mirror.source(self.mirror_name(url))
+        entry = self.cache.lookup(url) if self.cache else None
+        return entry["blob"] if entry else None
+
+    def _fetch_file(self, url, revalidate=False):
+        cache = self.cache
+        entry = cache.lookup(url)
+        if entry and (cache.offline or (cache.is_fresh(entry) and not revalidate)):
+            cache.record(hit=True)
+            return cache.blob_path(entry["blob"])
+        if cache.offline:
+            cache.record(hit=False)
+            self.log(f"[-] Offline mode: {url} is not cached.", Fore.RED)
+            return None
+
+        headers = cache.conditional_headers(entry) if entry else {}
+        try:
+            with self.session.get(url, headers=headers, timeout=self.timeout, stream=True) as req:
+                # 304 : our copy is still up to date, nothing to download
+                if req.status_code == 304 and entry:
+                    cache.touch(url, entry, req.headers)
+                    cache.record(hit=True, revalidated=True, not_modified=True)
+                    return cache.blob_path(entry["blob"])
+                req.raise_for_status()
+                entry = cache.store(url, req.iter_content(chunk_size=64 * 1024), req.headers)
+                cache.record(hit=False, revalidated=bool(headers))
+                self.metrics.add("bytes_downloaded", entry["size"])
+                return cache.blob_path(entry["blob"])
+        except requests.exceptions.RequestException as e:
+            # the network failed but an older copy is better than nothing
+            if entry:
+                cache.record(hit=True)
+                self.log(f"[!] Using cached copy of {url}: {e}", Fore.YELLOW)
+                return cache.blob_path(entry["blob"])
+            cache.record(hit=False)
+            self.log(f"[-] Error fetching data from {url}: {e}", Fore.RED)
+            return None
 
     # method to fetch JSON data from a given URL
     # this method writen to not repeat the same code everytime
     # we need to fetch JSON data from a URL
     def get_json(self, url):
         """
-        This method fetches JSON data from the provided URL.
+        This method fetches JSON data from the provided URL
+        (through the on-disk cache when it is enabled).
         """
+        if self.cache is None and self.mirror is None:
+            try:
+                with self.metrics.stage("fetch"):
+                    req = self.session.get(url, timeout=self.timeout)
+                    req.raise_for_status()
+                self.metrics.add("bytes_downloaded", len(req.content))
+                with self.metrics.stage("decode"):
+                    return req.json()
+            except requests.exceptions.RequestException as e:
+                self.log(f"[-] Error fetching data from {url}: {e}", Fore.RED)
+                return None
+
+        path = self.fetch_file(url)
+        if path is None:
+            return None
         try:
-            req = requests.get(url, timeout=10)
-            req.raise_for_status()
-            return req.json()
-        except requests.exceptions.RequestException as e:
-            print(Fore.RED + f"[-] Error fetching data from {url}: {e}" + Style.RESET_ALL)
+            with self.metrics.stage("decode"), open_path(path) as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            self.log(f"[-] Error reading cached data for {url}: {e}", Fore.RED)
             return None
 
-    def fetch_competition_ids(self):
+    def event_store(self, competition_id=None, season_id=None):
+        """
+        Return the columnar EventStore of a competition / season
+        (the selected one by default), None when the cache is off.
+        """
+        competition_id = competition_id or self.competition_id
+        season_id = season_id or self.season_id
+        if self.cache is None or not (competition_id and season_id):
+            return None
+        key = (competition_id, season_id)
+        if key not in self._stores:
+            self._stores[key] = EventStore(os.path.join(self.cache.directory, "store"), competition_id, season_id)
+        return self._stores[key]
 
+    def stored_events(self, match_id):
         """
-        this method will fetch competition infos
-        such as competition id and season id
+        Return the stored EventTable of a match if it was built from the
+        cached copy of its events file, None otherwise. No network access.
         """
-        competition_url = self.base_url + "competitions.json"
-        competition_data = self.get_json(competition_url)
-        # filter for La Liga competition
-        for competition in competition_data:
-            if competition['competition_name'] == 'La Liga' and competition['season_name'] == self.season:
-                self.competition_id = competition['competition_id']
-                self.season_id = competition['season_id']
-                print(f"[+] Fetched competition info for La Liga {self.season}.")
-                return self.competition_id, self.season_id
-        print("[-] Competition info not found.")
+        store = self.event_store()
+        if store is None:
+            return None
+        source = self.local_source(f"{self.base_url}events/{match_id}.json")
+        if source and store.has(match_id, source):
+            with self.metrics.stage("store_load"):
+                return store.load(match_id)
         return None
 
-    def team_select(self, teams):
+    def load_events(self, match_id):
         """
-        This method prompts user to select a team from the fetched teams list.
+        Stream-parse the events of a match into a compact EventTable,
+        keeping only the fields the analyzers need.
+        The file is read from the cache (or straight from the response
+        when the cache is off), one event at a time. The table is saved
+        in the columnar event store on first use and memory-mapped later.
+        Tables stay in the in-memory cache while the budget allows.
         """
+        table = self.memory.get(match_id)
+        if table is not None:
+            return table
+        table = self._load_events(match_id)
+        if table is not None:
+            self.memory.put(match_id, table)
+        return table
+
+    def _load_events(self, match_id):
+        table = self.stored_events(match_id)
+        if table is not None:
+            return table
+
+        events_url = f"{self.base_url}events/{match_id}.json"
         try:
-            try:
-                # Prepare for case-insensitive selection:
-                # - Build a lowercase lookup list from the provided 'teams'.
-                teams_l = [t.lower() for t in teams]
-                while True:
-                    team_choice = input(Fore.GREEN + "    Your choice: " + Style.RESET_ALL).strip()
-                    if team_choice.lower() in teams_l:
-                        return teams[teams_l.index(team_choice.lower())]
-                    else:
-                        print(Fore.RED + "[-] Invalid team selection. Please choose a valid team from the list." + Style.RESET_ALL)
-            except ValueError as e:
-                print(Fore.RED + f"[-] An error occurred during team selection: {e}" + Style.RESET_ALL)
-        except KeyboardInterrupt:
-            print(Fore.RED + "\n[-] User interrupted the team selection. Exiting ..." + Style.RESET_ALL)
-            sys.exit(0)
+            if self.cache is None and self.mirror is None:
+                with self.session.get(events_url, timeout=self.timeout, stream=True) as req:
+                    req.raise_for_status()
+                    # let urllib3 undo the gzip encoding while we read
+                    req.raw.decode_content = True
+                    with self.metrics.stage("parse"):
+                        table = read_events(req.raw)
+                    self.metrics.add("events_parsed", len(table))
+                    return table
+
+            path = self.fetch_file(events_url)
+            if path is None:
+                return None
+            with self.metrics.stage("parse"), open_path(path) as f:
+                table = read_events(f)
+            self.metrics.add("events_parsed", len(table))
+            store = self.event_store()
+            if store is not None:
+                with self.metrics.stage("store_save"):
+                    store.save(match_id, table, source=path_source(path))
+            return table
+        except (requests.exceptions.RequestException, OSError, ValueError) as e:
+            self.log(f"[-] Error reading events from {events_url}: {e}", Fore.RED)
+            return None
 
-    def fetch_teams(self):
+    def cache_stats(self):
         """
-        Fetch and display teams participating in the selected competition.
+        Return the cache hit / miss counters (empty dict if the cache is off).
         """
-        if not (self.competition_id and self.season_id):
-            self.fetch_competition_ids()
+        return self.cache.stats() if self.cache else {}
 
-        matches_url = f"{self.base_url}matches/{self.competition_id}/{self.season_id}.json"
-        data = self.get_json(matches_url)
-        if not data:
-            print("[-] Failed to fetch matches data.")
-            return None
-
-        # --- Using pandas to extract teams efficiently ---
-        df = pd.DataFrame(data)
+    def memory_stats(self):
+        """
+        Return the in-memory cache counters : entries, bytes, budget,
+        hits, misses, evictions and expirations.
+        """
+        return self.memory.stats()
 
-        # Extract team names from nested dicts using .apply()
-        home_teams = df["home_team"].apply(lambda x: x["home_team_name"])
-        away_teams = df["away_team"].apply(lambda x: x["away_team_name"])
+    def competition_catalog(self, refresh=False):
+        """
+        Return the CompetitionCatalog of every competition / season.
+        It is built once from competitions.json and re-built only when the
+        cached file changes ; refresh=True revalidates the file first.
+        Returns None if competitions.json is not available.
+        """
+        competition_url = self.base_url + "competitions.json"
+        if self.cache is None:
+            if self._competitions is not None and not refresh:
+                return self._competitions
+            data = self.get_json(competition_url)
+            if not data:
+                return None
+            with self.metrics.stage("catalog"):
+                self._competitions = CompetitionCatalog(data)
+            return self._competitions
+
+        path = self.fetch_file(competition_url, revalidate=refresh)
+        if path is None:
+            return None
+        # content hash of the file (cache blob name or mirror sha256)
+        source = path_source(path)
+        if self._competitions is None or self._competitions.source != source:
+            try:
+                with self.metrics.stage("decode"), open_path(path) as f:
+                    data = json.load(f)
+            except (OSError, ValueError) as e:
+                self.log(f"[-] Error reading cached data for {competition_url}: {e}", Fore.RED)
+                return None
+            with self.metrics.stage("catalog"):
+                self._competitions = CompetitionCatalog(data, source)
+        return self._competitions
+
+    def select(self, competition=None, season=None):
+        """
+        Target another competition and / or season, the ids are
+        resolved again on the next call.
+        """
+        if competition is not None:
+            self.competition = competition
+        if season is not None:
+            self.season = season
+        self.competition_id = None
+        self.season_id = None
 
-        # Combine and sort
-        all_teams = pd.concat([home_teams, away_teams]).drop_duplicates().sort_values().reset_index(drop=True)
+    def for_season(self, competition_id, season_id):
+        """
+        Return an analyzer targeting another competition / season that
+        shares this one's cache, session, catalogs, stores and metrics
+        (cheap, used to serve many seasons from one process).
+        """
+        other = copy.copy(self)
+        other.competition_id = competition_id
+        other.season_id = season_id
+        entry = self._competitions.get(competition_id, season_id) if self._competitions else None
+        if entry is not None:
+            other.competition = entry["competition_name"]
+            other.season = entry["season_name"]
+        return other
 
-        print(Fore.GREEN + "\n[+] Teams found in La Liga:\n" + Style.RESET_ALL)
-        for team in all_teams:
-            sys.stdout.write(f"\n\t{Fore.CYAN}{team}{Style.RESET_ALL}")
-            sys.stdout.flush()
-            time.sleep(0.02)
-        print("\n" + "-"*50)
-        print(f"""{Fore.RED}\n\n!--> Note: If the selected match is not found!
-              Try to pick *Barcelona* as they have the most matches
-                on the StatsBomb API\n""")
+    def fetch_competition_ids(self):
 
-        print(Fore.CYAN + "\n[+] Home Team Name: " + Style.RESET_ALL)
-        # get home team from team_select method
-        selected_home_team = self.team_select(all_teams.tolist())
+        """
+        this method will fetch competition infos
+        such as competition id and season id
+        """
+        catalog = self.competition_catalog()
+        if catalog is None:
+            self.log("[-] Failed to fetch competitions data.", Fore.RED)
+            return None
+        # O(1) lookup of the competition / season, fuzzy competition names
+        competition = catalog.find(self.competition, self.season)
+        if competition is None:
+            self.log(f"[-] Competition info not found for {self.competition} {self.season}.", Fore.RED)
+            return None
+        self.competition_id = competition['competition_id']
+        self.season_id = competition['season_id']
+        self.log(f"[+] Fetched competition info for {competition['competition_name']} {self.season}.")
+        return self.competition_id, self.season_id
 
-        print(Fore.CYAN + "\n[+] Away Team Name: " + Style.RESET_ALL)
-        # get home team from team_select method
-        selected_away_team = self.team_select(all_teams.tolist())
+    def match_catalog(self, competition_id=None, season_id=None, refresh=False):
+        """
+        Return the MatchCatalog of a competition / season (the selected one
+        by default). It is built once from the matches feed, kept in memory
+        and saved next to the cache, so later runs skip re-parsing the feed
+        as long as the cached feed did not change.
+        refresh=True revalidates the cached feed first.
+        """
+        competition_id = competition_id or self.competition_id
+        season_id = season_id or self.season_id
+        key = (competition_id, season_id)
+        if key in self._catalogs and not refresh:
+            return self._catalogs[key]
+
+        matches_url = f"{self.base_url}matches/{competition_id}/{season_id}.json"
+        if self.cache is None:
+            data = self.get_json(matches_url)
+            if not data:
+                return None
+            with self.metrics.stage("catalog"):
+                catalog = MatchCatalog.from_feed(competition_id, season_id, data)
+        else:
+            path = self.fetch_file(matches_url, revalidate=refresh)
+            if path is None:
+                return None
+            # content hash of the feed (cache blob name or mirror sha256)
+            source = path_source(path)
+            saved = os.path.join(self.cache.directory, "catalogs", f"matches_{competition_id}_{season_id}.json")
+            catalog = MatchCatalog.load(saved)
+            if catalog is None or catalog.source != source:
+                data = self.get_json(matches_url)
+                if not data:
+                    return None
+                with self.metrics.stage("catalog"):
+                    catalog = MatchCatalog.from_feed(competition_id, season_id, data, source)
+                    catalog.save(saved)
+
+        self._catalogs[key] = catalog
+        return catalog
+
+    def _season_catalog(self, refresh=False):
+        """
+        MatchCatalog of the selected season, resolving its ids first.
+        Returns None (the failure is logged) if it can not be fetched.
+        """
+        if not (self.competition_id and self.season_id):
+            if not self.fetch_competition_ids():
+                return None
+        catalog = self.match_catalog(refresh=refresh)
+        if catalog is None:
+            self.log("[-] Failed to fetch matches data.", Fore.RED)
+        return catalog
 
-        if selected_home_team == selected_away_team:
-            print(Fore.RED + "[-] Home and Away teams cannot be the same." + Style.RESET_ALL)
-            return self.fetch_teams()
+    def fetch_teams(self):
+        """
+        Return the sorted names of the teams of the selected season
+        (None if the matches could not be fetched).
+        """
+        # the catalog is built once per season and re-used by fetch_match_data
+        catalog = self._season_catalog()
+        if catalog is None:
+            return None
+        return catalog.teams()
 
-        print(f"\n[+] Selected match: {Fore.CYAN}{selected_home_team}{Style.RESET_ALL} VS {Fore.CYAN}{selected_away_team}{Style.RESET_ALL}")
-        self.fetch_match_data(selected_home_team, selected_away_team)
-        return all_teams.tolist()
+    def find_match(self, home_team, away_team):
+        """
+        Return the matches feed entry of home_team VS away_team
+        (case-insensitive) or None if they did not play each other.
+        """
+        catalog = self._season_catalog()
+        if catalog is None:
+            return None
+        # O(1) fixture lookup in the catalog index, no extra download
+        return catalog.find(home_team, away_team)
 
     def fetch_match_data(self, home_team, away_team):
         """
         Fetch events data for a specific match between
         home_team and away_team if found.
+        Returns the parsed EventTable or None.
         """
-        # Get match ID first
-        try:
-            matches_url = f"{self.base_url}matches/{self.competition_id}/{self.season_id}.json"
-            data = self.get_json(matches_url)
-            for match in data:
-                print(f"[+] {Fore.GREEN}Found match{Style.RESET_ALL}: {match['home_team']['home_team_name']} VS {match['away_team']['away_team_name']}")
-                # check if this is the match we are looking for and get its id
-                if (match["home_team"]["home_team_name"].lower() == home_team.lower() and
-                    match["away_team"]["away_team_name"].lower() == away_team.lower()):
-                    match_id = match["match_id"]
-                    print("[+] Fetching events data for the match...")
-                    print("*"*70)
-                    print(f"\n {Fore.YELLOW}[+] Found match ID:{Style.RESET_ALL} {match_id}")
-                    events_url = f"{self.base_url}events/{match_id}.json"
-                    print(Fore.CYAN + "\n[+] Match Events Data URL:\n" + Style.RESET_ALL, events_url)
-                    events_data = self.get_json(events_url)
-                    # if events data is found, return it
-                    self.analyze_match_summary(events_data)
-                    return events_data
-
-            # if no match is found,
-            # inform the user with available teams and matches
-            print(f"\n[-] {Style.BRIGHT}Match not found on statsbomb database.{Style.RESET_ALL} ")
-            print('see available teams and matches above')
-            return None
-        except KeyboardInterrupt:
-            exit(Fore.RED + "\n[-] User interrupted the match data fetching. Exiting ..." + Style.RESET_ALL)
+        match = self.find_match(home_team, away_team)
+        if match is None:
+            self.log(f"[-] {home_team} VS {away_team} not found on statsbomb database.", Fore.RED)
+            return None
+        # parsed once, the same table serves both analyzers
+        return self.load_events(match["match_id"])
+
+    def _match_events(self, events):
+        """The events of a match id (any integer type, numpy ones too), other values as given."""
+        if isinstance(events, numbers.Integral) and not isinstance(events, bool):
+            return self.load_events(int(events))
+        return events
 
     def analyze_match_summary(self, events):
         """
         Analyze full match events and produce a summary table for each team.
+        `events` can be the raw events list, an EventTable or a match id
+        (loaded from the event store when it was analyzed before).
         """
-        records = []  # an empty list to hold event records
-        for e in events:
-            if not e:
-                continue
-            # as the events data is nested JSON, we need can use .get() method
-            # to safely extract values and avoid KeyErrors (*_-)
-            records.append({
-                "team": e.get("team", {}).get("name"),
-                "event": e.get("type", {}).get("name"),
-                "outcome": e.get("shot", {}).get("outcome", {}).get("name") if "shot" in e else None,
-                "pass_type": e.get("pass", {}).get("type", {}).get("name") if "pass" in e else None,
-                "card_type": e.get("foul_committed", {}).get("card", {}).get("name") if "foul_committed" in e else None
-            })
-        df = pd.DataFrame(records)
-
-        df = df.dropna(subset=["team"])
-
-        stats = {}
-        # .unique() to get unique team names ,
-        # it will return a Numpy array > "ndarray"
-        for team in df["team"].unique():
-            team_df = df[df["team"] == team]
-
-            shots = len(team_df[team_df["event"] == "Shot"])
-            goals = len(team_df[(team_df["event"] == "Shot") & (team_df["outcome"] == "Goal")])
-            passes = len(team_df[team_df["event"] == "Pass"])
-            fouls = len(team_df[team_df["event"] == "Foul Committed"])
-            corners = len(team_df[(team_df["event"] == "Pass") & (team_df["pass_type"] == "Corner")])
-            yellow_cards = len(team_df[team_df["card_type"] == "Yellow Card"])
-            red_cards = len(team_df[team_df["card_type"] == "Red Card"])
-
-            # store stats in a dictionary declared above ,
-            # the key is the team name
-
-            stats[team] = {
-                "Shots": shots,
-                "Goals": goals,
-                "Passes": passes,
-                "Fouls": fouls,
-                "Corners": corners,
-                "Yellow Cards": yellow_cards,
-                "Red Cards": red_cards
-            }
-
-        # display stats in a tabular format using pandas DataFrame
-        stats_df = pd.DataFrame(stats).T  #
-        # fill NaN values with 0 and convert to integer type
-        # for better readability
-        stats_df = stats_df.fillna(0).astype(int)
-
-        # print final score
-        if len(stats_df) == 2:
-            teams = stats_df.index.tolist()
-            score = f"{teams[0]} {stats_df.loc[teams[0], 'Goals']} - {stats_df.loc[teams[1], 'Goals']} {teams[1]}"
-            print(Fore.CYAN + "\n[+] Final Score:" + Style.RESET_ALL, Fore.YELLOW + score + Style.RESET_ALL + "\n")
-        print("*"*70)
-        summary = "\n[+] Match Summary Table:\n"
-        for s in summary:
-            sys.stdout.write(f"{Fore.CYAN}{s}{Style.RESET_ALL}")
-            sys.stdout.flush()
-            time.sleep(0.05)
-        # print the stats dataframe
-        print(stats_df)
-
-        print(Fore.GREEN + "\n[!] Match analysis completed successfully!" + Style.RESET_ALL)
-        if self.indvidual_stats_prompt():
-            self.analyze_player_stats(events)
+        events = self._match_events(events)
+        if events is None:
+            return None
+        # flatten the nested events once into categorical columns,
+        # then compute every counter of TEAM_METRICS in one grouped pass
+        with self.metrics.stage("summary"):
+            df = as_frame(events)
+            stats_df = team_summary(df, self.team_metrics)
         return stats_df
 
-    def indvidual_stats_prompt(self):
+    def iter_season(self, concurrency=8, processes=0, chunksize=4):
         """
-            prompt user to continue to individual player stats analysis or exit
+        Summarize every match of the selected season concurrently with a
+        bounded thread pool and yield (match, stats_df) as soon as each
+        match is done (stats_df is None if the match failed).
+        With processes > 0 (and the cache on) the events are parsed on a
+        pool of worker processes instead, see _iter_season_processes.
         """
+        catalog = self._season_catalog()
+        if catalog is None:
+            return
+        if processes and self.cache is not None:
+            yield from self._iter_season_processes(catalog, concurrency, processes, chunksize)
+            return
+
+        pool = ThreadPoolExecutor(max_workers=concurrency)
         try:
-            while True:
-                choice = input(Fore.GREEN + "\n[+] Do you want to analyze this match individual player stats?  (y/n): " + Style.RESET_ALL).strip().lower()
-                if choice == 'y':
-                    return True
-                elif choice == 'n':
-                    print(Fore.CYAN + "\n[+] Exiting individual players stats analysis." + Style.RESET_ALL)
-                    return False
-                else:
-                    print(Fore.RED + "[-] Invalid choice. Please enter 'y' or 'n'." + Style.RESET_ALL)
+            futures = {pool.submit(self.analyze_match_summary, m["match_id"]): m for m in catalog.matches}
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+        finally:
+            # stop pending downloads if the caller stops early
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def _iter_season_processes(self, catalog, concurrency, processes, chunksize):
+        """
+        Multi-core season path : the events files are downloaded into the
+        cache by the thread pool, then their paths are shipped to
+        `processes` worker processes that parse them into compact
+        EventTables. Results come back in catalog order, so the output
+        is exactly the same as the serial path.
+        """
+        def fetch(match):
+            return self.fetch_file(f"{self.base_url}events/{match['match_id']}.json")
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            paths = list(pool.map(fetch, catalog.matches))
+
+        # matches already in the event store are memory-mapped,
+        # only the others are sent to the worker processes
+        store = self.event_store(catalog.competition_id, catalog.season_id)
+        found = []
+        to_parse = []
+        for match, path in zip(catalog.matches, paths):
+            if path is None:
+                yield match, None
+                continue
+            stored = store.has(match["match_id"], path_source(path))
+            found.append((match, path, stored))
+            if not stored:
+                to_parse.append(path)
+
+        tables = parse_event_files(to_parse, workers=processes, chunksize=chunksize)
+        for match, path, stored in found:
+            if stored:
+                with self.metrics.stage("store_load"):
+                    table = store.load(match["match_id"])
+            else:
+                # time spent waiting for the workers
+                with self.metrics.stage("parse"):
+                    table = next(tables)
+                self.metrics.add("events_parsed", len(table))
+                with self.metrics.stage("store_save"):
+                    store.save(match["match_id"], table, source=path_source(path))
+            yield match, self.analyze_match_summary(table)
+        tables.close()
+
+    def analyze_season(self, concurrency=8, verbose=True, processes=0, chunksize=4):
+        """
+        Analyze every match of the selected season and reduce them into
+        a league table (points, goals for / against, shots, passes, cards).
+        Progress is reported (see log) as matches complete.
+        processes / chunksize : see iter_season.
+        The matches are added to the player index as well (cache on).
+        Returns None if the season or its matches can not be fetched.
+        """
+        if self._season_catalog() is None:
+            return None
+        rows = []
+        done = 0
+        for match, stats_df in self.iter_season(concurrency, processes, chunksize):
+            done += 1
+            if stats_df is None:
+                self.log(f"[-] Skipped match {match['match_id']}: events not available.", Fore.RED)
+                continue
+            rows.extend(league_rows(match, stats_df))
+            if verbose:
+                total = len(self.match_catalog())
+                self.log(f"[+] ({done}/{total}) {Fore.CYAN}{match['home_team']}{Style.RESET_ALL} "
+                         f"{match['home_score']} - {match['away_score']} "
+                         f"{Fore.CYAN}{match['away_team']}{Style.RESET_ALL}")
+        # the analyzed matches feed the player index (the tables are
+        # still in memory or in the event store)
+        if self.player_index() is not None:
+            self.index_players(concurrency)
+        return league_table(rows)
+
+    def season_totals(self, competition_id=None, season_id=None):
+        """
+        Return the persisted SeasonTotals of a competition / season
+        (the selected one by default), None when the cache is off.
+        """
+        competition_id = competition_id or self.competition_id
+        season_id = season_id or self.season_id
+        if self.cache is None or not (competition_id and season_id):
+            return None
+        return SeasonTotals(os.path.join(self.cache.directory, "totals"), competition_id, season_id,
+                            self.team_metrics, self.player_metrics)
+
+    def _match_contribution(self, match, revalidate):
+        """
+        Load the events of a match (revalidated first when the match was
+        revised) and return its (summary, players) tables, None on failure.
+        """
+        match_id = match["match_id"]
+        if revalidate and self.cache is not None:
+            self.fetch_file(f"{self.base_url}events/{match_id}.json", revalidate=True)
+            self.memory.pop(match_id)
+        table = self.load_events(match_id)
+        if table is None:
+            return None
+        self.index_match(match_id, table)
+        return self.analyze_match_summary(table), self.analyze_player_stats(table)
+
+    def refresh_season(self, concurrency=8, verbose=True):
+        """
+        Bring the persisted season totals up to date : the matches feed is
+        revalidated and diffed against the folded matches, removed and
+        revised matches are retracted, and only new or revised matches are
+        analyzed (on a bounded thread pool) and folded in.
+        Returns the SeasonTotals (see totals.py), None on failure.
+        """
+        if self.cache is None:
+            self.log("[-] Season totals need the cache.", Fore.RED)
+            return None
+        catalog = self._season_catalog(refresh=True)
+        if catalog is None:
+            return None
+        totals = self.season_totals()
+
+        new, changed, removed = totals.diff(catalog.matches)
+        self.log(f"[+] {len(new)} new, {len(changed)} revised, {len(removed)} removed matches "
+                 f"({len(totals)} already folded).")
+        for match_id in changed + removed:
+            totals.retract(match_id)
+
+        revised = set(changed)
+        todo = [catalog.get(match_id) for match_id in new + changed]
+        with self.metrics.stage("refresh"), ThreadPoolExecutor(max_workers=concurrency) as pool:
+            futures = {pool.submit(self._match_contribution, m, m["match_id"] in revised): m for m in todo}
+            for done, future in enumerate(as_completed(futures), 1):
+                match = futures[future]
+                result = future.result()
+                if result is None:
+                    self.log(f"[-] Skipped match {match['match_id']}: events not available.", Fore.RED)
+                    continue
+                totals.add(match, *result)
+                if verbose:
+                    self.log(f"[+] ({done}/{len(todo)}) {Fore.CYAN}{match['home_team']}{Style.RESET_ALL} "
+                             f"{match['home_score']} - {match['away_score']} "
+                             f"{Fore.CYAN}{match['away_team']}{Style.RESET_ALL}")
+        totals.save()
+        # the analyzed matches were added to the player index too
+        self.player_index().save()
+        return totals
+
+    def season_tables(self, concurrency=8):
+        """
+        Load the EventTable of every match of the selected season with a
+        bounded thread pool. Returns [(match, table)] in catalog order,
+        matches whose events are not available are left out.
+        """
+        catalog = self._season_catalog()
+        if catalog is None:
+            return []
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            tables = list(pool.map(lambda m: self.load_events(m["match_id"]), catalog.matches))
+        return [(match, table) for match, table in zip(catalog.matches, tables) if table is not None]
+
+    def player_index(self):
+        """
+        Return the persistent PlayerIndex (players.py) kept next to the
+        cache, None when the cache is off.
+        """
+        if self.cache is None:
+            return None
+        if "players" not in self._indexes:
+            self._indexes["players"] = PlayerIndex(os.path.join(self.cache.directory, "players"),
+                                                   self.player_metrics)
+        return self._indexes["players"]
 
-        except KeyboardInterrupt as e:
-            print(Fore.RED + f"[-] An error occurred in individual stats analysis: {e}" + Style.RESET_ALL)
+    def index_match(self, match_id, table, competition_id=None, season_id=None, save=False):
+        """
+        Add the players of an analyzed match to the player index
+        (and save it with save=True). Returns True if the match was added.
+        """
+        index = self.player_index()
+        if index is None:
+            return False
+        source = self.local_source(f"{self.base_url}events/{match_id}.json")
+        with self.metrics.stage("index"):
+            added = index.add_match(competition_id or self.competition_id, season_id or self.season_id,
+                                    match_id, table, source)
+        if added and save:
+            index.save()
+        return added
+
+    def index_players(self, concurrency=8):
+        """
+        Add every match of the selected season that is not indexed yet
+        (or whose events file changed) to the player index and save it.
+        Returns the PlayerIndex.
+        """
+        index = self.player_index()
+        if index is None:
+            self.log("[-] The player index needs the cache.", Fore.RED)
+            return None
+        catalog = self._season_catalog()
+        if catalog is None:
             return None
 
+        def add(match):
+            match_id = match["match_id"]
+            if index.has(match_id, self.local_source(f"{self.base_url}events/{match_id}.json")):
+                return False
+            table = self.load_events(match_id)
+            return table is not None and self.index_match(match_id, table)
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            added = sum(pool.map(add, catalog.matches))
+        index.save()
+        self.log(f"[+] {added} matches added to the player index "
+                 f"({index.match_count()} matches, {len(index)} players).")
+        return index
+
+    def player_career(self, player, competition=None, season=None):
+        """
+        Counters of a player (name, partial name or id) per competition /
+        season from the player index, optionally for one competition
+        and / or season. Only indexed matches count (see index_players).
+        Every player matching the name is returned (best match first),
+        told apart by the player_id column.
+        Returns a DataFrame or None if the player is unknown.
+        """
+        index = self.player_index()
+        ids = index.lookup(player) if index else []
+        if not ids:
+            self.log(f"[-] Player {player} not found in the player index.", Fore.RED)
+            return None
+        if len(ids) > 1:
+            self.log(f"[!] {len(ids)} players match {player}, see the player_id column.", Fore.YELLOW)
+
+        seasons = None
+        catalog = self.competition_catalog()
+        if competition is not None or season is not None:
+            if catalog is None:
+                self.log("[-] Failed to fetch competitions data.", Fore.RED)
+                return None
+            entries = catalog.seasons(competition) if competition is not None else catalog.entries
+            seasons = [(e["competition_id"], e["season_id"]) for e in entries
+                       if season is None or e["season_name"] == season]
+        with self.metrics.stage("index"):
+            tables = []
+            for player_id in ids:
+                totals = index.totals(player_id, seasons)
+                totals.insert(0, "player", index.name(player_id))
+                totals.insert(0, "player_id", player_id)
+                tables.append(totals)
+            totals = pd.concat(tables, ignore_index=True)
+        # competition / season names from the catalog
+        entries = [catalog.get(c, s) if catalog else None
+                   for c, s in zip(totals["competition_id"], totals["season_id"])]
+        totals.insert(2, "season", [e["season_name"] if e else None for e in entries])
+        totals.insert(2, "competition", [e["competition_name"] if e else None for e in entries])
+        return totals
+
+    def analyze_pass_network(self, events):
+        """
+        Pass network of both teams of a match : dict team -> PassNetwork
+        (network.py) with the passer -> recipient matrix of the completed
+        passes and the average position of every player.
+        `events` can be the raw events list, an EventTable or a match id.
+        """
+        events = self._match_events(events)
+        if events is None:
+            return None
+        with self.metrics.stage("network"):
+            return pass_networks(events)
+
+    def season_pass_network(self, concurrency=8):
+        """
+        Pass networks of every team over the whole selected season,
+        the match tables are stacked and aggregated in one pass.
+        """
+        tables = [table for match, table in self.season_tables(concurrency)]
+        if not tables:
+            return None
+        with self.metrics.stage("network"):
+            return pass_networks(tables)
+
+    def analyze_timeline(self, events, window=15, by="team", per_period=True):
+        """
+        Counters of the match summary (by="team") or of the player table
+        (by="player") per period and per bucket of `window` minutes,
+        see timeline.py. `events` can be the raw events list, an
+        EventTable or a match id.
+        """
+        events = self._match_events(events)
+        if events is None:
+            return None
+        metrics = self.team_metrics if by == "team" else self.player_metrics
+        with self.metrics.stage("timeline"):
+            return timeline(events, window, by, metrics, per_period)
+
+    def season_timeline(self, window=15, by="team", per_period=True, concurrency=8):
+        """
+        Timeline of every team (or player) summed over the whole selected
+        season, binned in one pass over the stacked match tables.
+        """
+        tables = [table for match, table in self.season_tables(concurrency)]
+        if not tables:
+            return None
+        return self.analyze_timeline(tables, window, by, per_period)
+
+    def analyze_heatmaps(self, events, by="team", bins=DEFAULT_BINS, event=None, location="start"):
+        """
+        Heatmaps of every team (or player) on a grid of `bins` cells of the
+        120 x 80 pitch, see spatial.heatmaps. `events` can be the raw
+        events list, an EventTable, a list of them or a match id.
+        """
+        events = self._match_events(events)
+        if events is None:
+            return None
+        with self.metrics.stage("spatial"):
+            return heatmaps(events, by, bins, event, location)
+
+    def analyze_shot_map(self, events):
+        """Shot map (start, end, team, player, outcome code) of a match, see spatial.shot_map."""
+        events = self._match_events(events)
+        if events is None:
+            return None
+        with self.metrics.stage("spatial"):
+            return shot_map(events)
+
+    def spatial_report(self, events=None, path=None, bins=DEFAULT_BINS, concurrency=8):
+        """
+        Team / player heatmaps and the shot map as numpy arrays of a match
+        (`events`) or, by default, of the whole selected season binned in
+        one pass. Written to `path` as .npz when given.
+        """
+        if events is None:
+            events = [table for match, table in self.season_tables(concurrency)]
+        else:
+            events = self._match_events(events)
+        if events is None or (isinstance(events, list) and not events):
+            return None
+        with self.metrics.stage("spatial"):
+            arrays = spatial_arrays(events, bins)
+            if path:
+                save_npz(path, arrays)
+        return arrays
+
+    def head_to_head(self, team_a, team_b, concurrency=8, refresh=False):
+        """
+        Every meeting of two teams in every competition / season of the
+        dataset, in both home / away orientations. The matches feeds, then
+        the meetings, are fetched and analyzed on a bounded thread pool.
+        Returns {"meetings": one row per match and team with the match
+        summary counters, "totals": league-style totals of both teams}.
+        Team names are resolved like MatchCatalog.resolve_team (case,
+        accents and punctuation ignored). Results are kept per team pair
+        (in memory and next to the cache) until competitions.json changes,
+        or refresh=True ; a pair where a team is unknown, or a meeting
+        could not be analyzed, is not kept.
+        """
+        catalog = self.competition_catalog()
+        if catalog is None:
+            self.log("[-] Failed to fetch competitions data.", Fore.RED)
+            return None
+        pair = "__".join(sorted(normalize_name(team).replace(" ", "_") for team in (team_a, team_b)))
+        memo = self._head_to_head_results
+        saved = os.path.join(self.cache.directory, "head_to_head", f"{pair}.json") if self.cache else None
+        result = memo.get(pair)
+        if result is None and saved and os.path.exists(saved):
+            try:
+                with open(saved, "r", encoding="utf-8") as f:
+                    result = json.load(f)
+            except (OSError, ValueError):
+                result = None
+        # results saved before the team names were checked are not trusted
+        if result is None or result.get("source") != catalog.source or "teams" not in result or refresh:
+            with self.metrics.stage("head_to_head"):
+                result = self._head_to_head(catalog, team_a, team_b, concurrency)
+            if None in result["teams"] or not result["complete"]:
+                # a misspelled team or a failed download : never cached
+                memo.pop(pair, None)
+            else:
+                memo[pair] = result
+                if saved:
+                    atomic_write_json(saved, result)
+        else:
+            memo[pair] = result
+
+        meetings = pd.DataFrame(result["meetings"], columns=result["columns"])
+        totals = league_table(result["league"])
+        if not meetings.empty:
+            counters = meetings.groupby("team")[[m for m in result["metrics"] if m not in totals.columns]].sum()
+            totals = totals.join(counters)
+        return {"meetings": meetings, "totals": totals}
+
+    def _head_to_head(self, catalog, team_a, team_b, concurrency):
+        # 1. the matches feed of every season, to find the meetings
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            seasons = list(pool.map(lambda e: self.match_catalog(e["competition_id"], e["season_id"]),
+                                    catalog.entries))
+        found = []
+        # display names of both teams, from the first season they play in
+        teams = [None, None]
+        complete = True
+        for entry, season in zip(catalog.entries, seasons):
+            if season is None:
+                complete = False
+                continue
+            home, away = season.resolve_team(team_a), season.resolve_team(team_b)
+            teams = [teams[0] or home, teams[1] or away]
+            if home and away:
+                found.extend((entry, match) for match in season.meetings(home, away))
+        for team, name in zip((team_a, team_b), teams):
+            if name is None:
+                self.log(f"[-] Team {team} not found in any season.", Fore.RED)
+        self.log(f"[+] {len(found)} meetings of {teams[0] or team_a} and {teams[1] or team_b} "
+                 f"in {len(catalog.entries)} seasons.")
+
+        # 2. analyze every meeting, each with the event store of its season
+        def summarize(item):
+            entry, match = item
+            view = self.for_season(entry["competition_id"], entry["season_id"])
+            return view.analyze_match_summary(match["match_id"])
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            summaries = list(pool.map(summarize, found))
+
+        metrics = [m.name for m in self.team_metrics]
+        columns = ["match_id", "competition", "season", "match_date", "home_team", "away_team",
+                   "home_score", "away_score", "team"] + metrics
+        meetings = []
+        league = []
+        for (entry, match), stats_df in zip(found, summaries):
+            if stats_df is None:
+                self.log(f"[-] Skipped match {match['match_id']}: events not available.", Fore.RED)
+                complete = False
+                continue
+            league.extend(league_rows(match, stats_df))
+            for team in (match["home_team"], match["away_team"]):
+                counters = [int(stats_df.loc[team, m]) if team in stats_df.index else 0 for m in metrics]
+                meetings.append([match["match_id"], entry["competition_name"], entry["season_name"],
+                                 match.get("match_date"), match["home_team"], match["away_team"],
+                                 match.get("home_score"), match.get("away_score"), team] + counters)
+        return {"source": catalog.source, "teams": teams, "complete": complete,
+                "columns": columns, "metrics": metrics, "meetings": meetings, "league": league}
+
     def analyze_player_stats(self, events):
         """
         Analyze individual player statistics from match events.
-        Arguments: events (list):
-        List of event dictionaries from the match.
+        Arguments: events (list or EventTable):
+        List of event dictionaries from the match, or the parsed events table.
         Returns:pd.DataFrame:
-        DataFrame containing individual player statistics.
-        """
-        records = []
-        # iterate over each event in the events list
-        for e in events:
-            # extract relevant details using .get() to avoid KeyErrors
-            player = e.get("player", {}).get("name")
-            team = e.get("team", {}).get("name")
-            event_type = e.get("type", {}).get("name")
-            # skip events without player or team info
-            if not player or not team:
-                continue
-
-            outcome = e.get("shot", {}).get("outcome", {}).get("name") if "shot" in e else None
-            pass_type = e.get("pass", {}).get("type", {}).get("name") if "pass" in e else None
-            # append event record to the records list declared above
-            records.append({
-                "player": player,
-                "team": team,
-                "event": event_type,
-                "outcome": outcome,
-                "pass_type": pass_type,
-            })
-        # convert records list to pandas DataFrame
-        df = pd.DataFrame(records)
-        df = df.dropna(subset=["player", "team"])
-
-        stats = []  # an empty list to hold player stats dictionaries
-        # iterate over each unique player in the DataFrame
-        for player in df["player"].unique():
-            player_df = df[df["player"] == player]
-            team_name = player_df["team"].iloc[0]
-
-            shots = len(player_df[player_df["event"] == "Shot"])
-            goals = len(player_df[(player_df["event"] == "Shot") & (player_df["outcome"] == "Goal")])
-            passes = len(player_df[player_df["event"] == "Pass"])
-
-            short_name = " ".join(player.split()[:3])
-            stats.append({
-                "player": short_name,
-                "team": team_name,
-                "Shots": shots,
-                "Goals": goals,
-                "Passes": passes
-            })
-        stats_df = pd.DataFrame(stats)
-        stats_df = stats_df.sort_values(["team", "Goals", "Shots"], ascending=[True, False, False])
-        print("*"*70)
-        statistics = "\n\t\t\t[+] Player Statistics:\n"
-        for st in statistics:
-            sys.stdout.write(f"{Fore.CYAN}{st}{Style.RESET_ALL}")
-            sys.stdout.flush()
-            time.sleep(0.08)
-        print("\n")
-        print("*"*70)
-        stats_df.reset_index(drop=True, inplace=True)
-        print(f"\n{stats_df}")
-        print(Fore.GREEN + "\n[!] Individual player stats analysis completed successfully!\n" + Style.RESET_ALL)
-        print("*"*70)
-        self.thank_you_message()
+        DataFrame containing individual player statistics,
+        one row per StatsBomb player id.
+        `events` can also be a match id, see analyze_match_summary.
+        """
+        events = self._match_events(events)
+        if events is None:
+            return None
+        # one pass over the flattened events, grouped on the player id
+        # so two players sharing a display name stay separate
+        with self.metrics.stage("players"):
+            df = as_frame(events)
+            stats_df = player_summary(df, self.player_metrics)
         return stats_df
-
-    def thank_you_message(self):
-        """
-        Display a thank you message to the user.
-        """
-        messages = [
-            "\n[+] Thank you for using Ballalysis - Football Analyzer!",
-            "\n[+] Developed by Tarik Ataia.",
-            "\n[+] Goodbye!"
-        ]
-        time.sleep(0.5)
-        for msg in messages:
-            for char in msg + "\n":
-                sys.stdout.write(char)
-                sys.stdout.flush()
-                time.sleep(0.05)
-
-    def main(self):
-        self.fetch_teams()
-        return True
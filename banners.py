@@ -14,7 +14,6 @@ Version: 1.0
 
 import sys
 import time
-import os
 import random
 
 from colorama import Fore
@@ -95,17 +94,24 @@ MSF_BANNER = f'''
 '''
 
 
+# ANSI escapes : clear screen, clear scrollback, cursor home
+CLEAR_SCREEN = "\033[2J\033[3J\033[H"
+
+
 def clear_console():
-    """Clear terminal screen in a cross-platform way."""
-    if os.name == "nt":
-        os.system("cls")
-    else:
-        os.system("clear")
+    """
+    Clear terminal screen with ANSI escapes instead of spawning a
+    `clear` / `cls` process (colorama translates them on Windows).
+    """
+    if sys.stdout.isatty():
+        sys.stdout.write(CLEAR_SCREEN)
+        sys.stdout.flush()
 
 
-def banners():
+def banners(fast=False):
     """
     Return a random banner string and print a short startup line.
+    With fast=True the quote is printed without the typewriter delay.
 
     Usage:
         print(banners())
@@ -123,7 +129,8 @@ def banners():
             for ch in starting:
                 sys.stdout.write(ch)
                 sys.stdout.flush()
-                time.sleep(0.02)
+                if not fast:
+                    time.sleep(0.02)
 
         return chosen
 
@@ -0,0 +1,436 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+benchmark.py - performance benchmarks for BallAlysis
+
+Generates a synthetic StatsBomb open data tree (competitions.json,
+matches/*.json, events/*.json) with the real nesting of the fields the
+analyzer reads (shot.outcome, pass.type, foul_committed.card, player ids
+with duplicate names across teams ...), serves it from a local HTTP
+server used as `base_url`, and times every stage separately :
+
+    fetch    -> download of the events files into an empty cache
+    decode   -> json.load of the whole files (the old code path)
+    flatten  -> streaming, field projected parse into EventTables
+    summary  -> StatsAnalyzer.analyze_match_summary
+    players  -> StatsAnalyzer.analyze_player_stats
+
+for 1, 38 and 380 matches by default. Results are written as JSON,
+and `--compare old.json` reports the stages that got slower.
+
+`--startup` measures the start-up of run.py instead, with
+`python -X importtime` : total import time, the slowest modules, and
+a failure if pandas / numpy / requests are imported at start-up. Its
+results go to their own file (bench_startup.json by default).
+
+Usage:
+    python3 benchmark.py --matches 1 38 380 --output bench_results.json
+    python3 benchmark.py --compare bench_results.json
+    python3 benchmark.py --startup [--compare bench_startup.json]
+
+Author: Tarik Ataia
+License: Free - Public - Open Source
+Version: 1.0
+"""
+
+import argparse
+import functools
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+from analyzer import StatsAnalyzer
+from events import read_events
+
+COMPETITION_ID = 11
+SEASON_ID = 4
+SEASON_NAME = "2018/2019"
+
+# 20 teams -> 380 fixtures in a double round robin, like La Liga
+TEAMS = [
+    "Barcelona", "Real Madrid", "Atlético Madrid", "Sevilla", "Valencia",
+    "Getafe", "Espanyol", "Athletic Club", "Real Sociedad", "Real Betis",
+    "Alavés", "Eibar", "Leganés", "Villarreal", "Levante",
+    "Real Valladolid", "Celta Vigo", "Girona", "Huesca", "Rayo Vallecano",
+]
+
+# a few names shared by two different players (different ids and teams)
+SHARED_NAMES = ["David Silva", "Sergio Gómez", "Álex Fernández"]
+
+# rough share of each event type in a real StatsBomb match
+EVENT_TYPES = [
+    ("Pass", 0.30), ("Ball Receipt*", 0.28), ("Carry", 0.22), ("Pressure", 0.08),
+    ("Ball Recovery", 0.03), ("Duel", 0.02), ("Clearance", 0.015), ("Foul Committed", 0.008),
+    ("Foul Won", 0.008), ("Shot", 0.008), ("Dribble", 0.007), ("Interception", 0.006),
+    ("Block", 0.005), ("Goal Keeper", 0.004), ("Miscontrol", 0.004), ("Offside", 0.001),
+]
+SHOT_OUTCOMES = [("Goal", 0.11), ("Saved", 0.25), ("Off T", 0.33), ("Blocked", 0.26), ("Wayward", 0.05)]
+PASS_TYPES = [(None, 0.88), ("Throw-in", 0.05), ("Free Kick", 0.03), ("Corner", 0.02), ("Goal Kick", 0.02)]
+
+STAGES = ["fetch", "decode", "flatten", "summary", "players"]
+
+# modules that must not be imported before the analysis starts
+HEAVY_MODULES = ("pandas", "numpy", "requests")
+
+
+# ---- synthetic data ----
+
+def weighted(rng, choices):
+    """Pick a value from a list of (value, weight) pairs."""
+    values, weights = zip(*choices)
+    return rng.choices(values, weights)[0]
+
+
+def squad(team_index):
+    """Return the 18 (id, name) players of a team."""
+    players = []
+    for n in range(18):
+        player_id = 1000 * (team_index + 1) + n
+        name = f"Player {player_id} {TEAMS[team_index]} Senior"
+        # teams 0 and 1 share some names with each other
+        if team_index in (0, 1) and n < len(SHARED_NAMES):
+            name = SHARED_NAMES[n]
+        players.append({"id": player_id, "name": name})
+    return players
+
+
+def fixtures(count):
+    """First `count` fixtures of a double round robin between TEAMS."""
+    pairs = [(h, a) for h in range(len(TEAMS)) for a in range(len(TEAMS)) if h != a]
+    return pairs[:count]
+
+
+def make_event(rng, index, team_index, players, second_total):
+    """One synthetic event with the nesting of the StatsBomb format."""
+    event_type = weighted(rng, EVENT_TYPES)
+    player = rng.choice(players)
+    period = 1 if second_total < 45 * 60 else 2
+    event = {
+        "id": f"{index:08x}-0000-0000-0000-000000000000",
+        "index": index,
+        "period": period,
+        "timestamp": "00:00:00.000",
+        "minute": second_total // 60,
+        "second": second_total % 60,
+        "type": {"id": 30, "name": event_type},
+        "possession": index // 20,
+        "possession_team": {"id": team_index, "name": TEAMS[team_index]},
+        "play_pattern": {"id": 1, "name": "Regular Play"},
+        "team": {"id": team_index, "name": TEAMS[team_index]},
+        "player": player,
+        "position": {"id": 1, "name": "Center Forward"},
+        "location": [round(rng.uniform(0, 120), 1), round(rng.uniform(0, 80), 1)],
+        "duration": round(rng.random(), 6),
+    }
+    if event_type == "Pass":
+        recipient = rng.choice(players)
+        event["pass"] = {
+            "recipient": recipient,
+            "length": round(rng.uniform(2, 50), 6),
+            "angle": round(rng.uniform(-3.14, 3.14), 6),
+            "height": {"id": 1, "name": "Ground Pass"},
+            "end_location": [round(rng.uniform(0, 120), 1), round(rng.uniform(0, 80), 1)],
+            "body_part": {"id": 40, "name": "Right Foot"},
+        }
+        pass_type = weighted(rng, PASS_TYPES)
+        if pass_type:
+            event["pass"]["type"] = {"id": 61, "name": pass_type}
+    elif event_type == "Shot":
+        event["shot"] = {
+            "statsbomb_xg": round(rng.random() / 3, 6),
+            "end_location": [round(rng.uniform(100, 120), 1), round(rng.uniform(30, 50), 1), 1.0],
+            "outcome": {"id": 97, "name": weighted(rng, SHOT_OUTCOMES)},
+            "technique": {"id": 93, "name": "Normal"},
+            "body_part": {"id": 40, "name": "Right Foot"},
+            "type": {"id": 87, "name": "Open Play"},
+            # freeze frames make shots the heaviest events of a file
+            "freeze_frame": [
+                {"location": [rng.uniform(80, 120), rng.uniform(0, 80)],
+                 "player": rng.choice(players), "position": {"id": 3, "name": "Right Center Back"},
+                 "teammate": rng.random() < 0.5}
+                for _ in range(14)
+            ],
+        }
+    elif event_type == "Foul Committed":
+        event["foul_committed"] = {}
+        card = rng.random()
+        if card < 0.15:
+            event["foul_committed"]["card"] = {"id": 7, "name": "Yellow Card"}
+        elif card < 0.16:
+            event["foul_committed"]["card"] = {"id": 5, "name": "Red Card"}
+    return event
+
+
+def make_dataset(root, matches=38, events_per_match=3500, seed=0):
+    """
+    Write a synthetic open data tree under `root` with `matches` matches
+    of `events_per_match` events each. Returns the list of match ids.
+    """
+    rng = random.Random(seed)
+    os.makedirs(os.path.join(root, "matches", str(COMPETITION_ID)), exist_ok=True)
+    os.makedirs(os.path.join(root, "events"), exist_ok=True)
+
+    competitions = [{
+        "competition_id": COMPETITION_ID, "season_id": SEASON_ID,
+        "country_name": "Spain", "competition_name": "La Liga",
+        "competition_gender": "male", "season_name": SEASON_NAME,
+    }]
+    with open(os.path.join(root, "competitions.json"), "w", encoding="utf-8") as f:
+        json.dump(competitions, f)
+
+    feed = []
+    for n, (home, away) in enumerate(fixtures(matches)):
+        match_id = 300000 + n
+        squads = {home: squad(home), away: squad(away)}
+        events = []
+        for index in range(events_per_match):
+            team_index = home if rng.random() < 0.5 else away
+            second_total = index * 95 * 60 // events_per_match
+            events.append(make_event(rng, index + 1, team_index, squads[team_index], second_total))
+        with open(os.path.join(root, "events", f"{match_id}.json"), "w", encoding="utf-8") as f:
+            json.dump(events, f)
+
+        home_goals = sum(1 for e in events if e["team"]["id"] == home and
+                         e.get("shot", {}).get("outcome", {}).get("name") == "Goal")
+        away_goals = sum(1 for e in events if e["team"]["id"] == away and
+                         e.get("shot", {}).get("outcome", {}).get("name") == "Goal")
+        feed.append({
+            "match_id": match_id,
+            "match_date": "2018-08-18",
+            "home_team": {"home_team_id": home, "home_team_name": TEAMS[home]},
+            "away_team": {"away_team_id": away, "away_team_name": TEAMS[away]},
+            "home_score": home_goals,
+            "away_score": away_goals,
+            "last_updated": "2020-07-29T05:00",
+        })
+    with open(os.path.join(root, "matches", str(COMPETITION_ID), f"{SEASON_ID}.json"), "w", encoding="utf-8") as f:
+        json.dump(feed, f)
+    return [m["match_id"] for m in feed]
+
+
+# ---- local stand-in for base_url ----
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(root):
+    """
+    Serve `root` on a free local port in a background thread.
+    Returns (server, base_url), call server.shutdown() when done.
+    """
+    handler = functools.partial(QuietHandler, directory=root)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/"
+
+
+# ---- timed stages ----
+
+def run_stages(base_url, match_ids, cache_dir):
+    """Time every stage over the given matches, returns {stage: seconds} and sizes."""
+    analyzer = StatsAnalyzer(base_url=base_url, season=SEASON_NAME, cache_dir=cache_dir, quiet=True)
+    timings = {}
+
+    start = time.perf_counter()
+    paths = [analyzer.fetch_file(f"{base_url}events/{match_id}.json") for match_id in match_ids]
+    timings["fetch"] = time.perf_counter() - start
+    downloaded = sum(os.path.getsize(path) for path in paths)
+
+    start = time.perf_counter()
+    for path in paths:
+        with open(path, "rb") as f:
+            json.load(f)
+    timings["decode"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    tables = []
+    for path in paths:
+        with open(path, "rb") as f:
+            tables.append(read_events(f))
+    timings["flatten"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for table in tables:
+        analyzer.analyze_match_summary(table)
+    timings["summary"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for table in tables:
+        analyzer.analyze_player_stats(table)
+    timings["players"] = time.perf_counter() - start
+
+    events = sum(len(table) for table in tables)
+    return timings, downloaded, events
+
+
+# ---- start-up ----
+
+def parse_importtime(output):
+    """
+    Parse the stderr of `python -X importtime` into {module: cumulative us}
+    for the top level imports and the set of every imported module.
+    """
+    top_level = {}
+    imported = set()
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative, name = line[len("import time:"):].split("|")
+        module = name.strip()
+        imported.add(module)
+        # nested imports are indented under their parent
+        if not name[1:].startswith(" "):
+            top_level[module] = int(cumulative)
+    return top_level, imported
+
+
+def startup_benchmark(repeat=5):
+    """
+    Import run.py `repeat` times in a fresh interpreter with -X importtime.
+    Returns the median import time, the slowest top level imports and
+    the heavy modules that were imported at start-up (should be none).
+    """
+    repo = os.path.dirname(os.path.abspath(__file__))
+    command = [sys.executable, "-X", "importtime", "-c", "import run"]
+    totals = []
+    wall = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        proc = subprocess.run(command, capture_output=True, text=True, cwd=repo)
+        wall.append(time.perf_counter() - start)
+        top_level, imported = parse_importtime(proc.stderr)
+        totals.append(sum(top_level.values()))
+    slowest = sorted(top_level.items(), key=lambda item: item[1], reverse=True)[:10]
+    return {
+        "import_ms": sorted(totals)[len(totals) // 2] / 1000,
+        "process_ms": sorted(wall)[len(wall) // 2] * 1000,
+        "slowest": [{"module": module, "ms": us / 1000} for module, us in slowest],
+        "heavy_modules": [m for m in HEAVY_MODULES if m in imported],
+    }
+
+
+def git_version():
+    """Current commit of the repo, to label the results."""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        return "unknown"
+
+
+def run_benchmark(match_counts, events_per_match, seed=0):
+    """Generate the data once (largest count) and run every size."""
+    workdir = tempfile.mkdtemp(prefix="ballalysis-bench-")
+    try:
+        data_root = os.path.join(workdir, "data")
+        print(f"[+] Generating {max(match_counts)} synthetic matches ...", file=sys.stderr)
+        match_ids = make_dataset(data_root, max(match_counts), events_per_match, seed)
+        server, base_url = serve(data_root)
+        runs = []
+        try:
+            for count in match_counts:
+                # a fresh cache per run, so "fetch" always downloads
+                cache_dir = os.path.join(workdir, f"cache-{count}")
+                timings, downloaded, events = run_stages(base_url, match_ids[:count], cache_dir)
+                runs.append({"matches": count, "events": events, "bytes": downloaded, "stages": timings})
+                print(f"[+] {count} matches : " + "  ".join(f"{stage} {timings[stage]:.3f}s" for stage in STAGES),
+                      file=sys.stderr)
+        finally:
+            server.shutdown()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        "version": git_version(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "events_per_match": events_per_match,
+        "runs": runs,
+    }
+
+
+def compare(current, baseline, threshold=1.10):
+    """
+    Print the ratio current / baseline of every stage, flagging the ones
+    slower than `threshold`. Returns the number of regressions.
+    """
+    regressions = 0
+    if current.get("startup") and baseline.get("startup"):
+        before, after = baseline["startup"]["import_ms"], current["startup"]["import_ms"]
+        ratio = after / before if before else 1.0
+        flag = "  <-- slower" if ratio > threshold else ""
+        regressions += bool(flag)
+        print(f"[startup] import  {before:8.1f}ms -> {after:8.1f}ms  x{ratio:.2f}{flag}")
+
+    old_runs = {run["matches"]: run for run in baseline.get("runs", [])}
+    for run in current.get("runs", []):
+        old = old_runs.get(run["matches"])
+        if old is None:
+            continue
+        for stage in STAGES:
+            before, after = old["stages"].get(stage), run["stages"].get(stage)
+            if not before or after is None:
+                continue
+            ratio = after / before
+            flag = "  <-- slower" if ratio > threshold else ""
+            regressions += bool(flag)
+            print(f"[{run['matches']:>4} matches] {stage:<8} {before:8.3f}s -> {after:8.3f}s  x{ratio:.2f}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BallAlysis benchmarks on synthetic StatsBomb data")
+    parser.add_argument("--matches", type=int, nargs="+", default=[1, 38, 380],
+                        help="match counts to benchmark (default: 1 38 380)")
+    parser.add_argument("--events", type=int, default=3500, help="events per match (default: 3500)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed of the synthetic data")
+    parser.add_argument("--output",
+                        help="where to write the JSON results "
+                             "(default: bench_results.json, bench_startup.json with --startup)")
+    parser.add_argument("--compare", help="previous results file to compare against")
+    parser.add_argument("--startup", action="store_true",
+                        help="only benchmark the start-up of run.py (python -X importtime)")
+    args = parser.parse_args()
+
+    # read the baseline first, it may be the file we are about to overwrite
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    if args.output is None:
+        args.output = "bench_startup.json" if args.startup else "bench_results.json"
+    if args.startup:
+        results = {"version": git_version(), "python": platform.python_version(),
+                   "startup": startup_benchmark()}
+        startup = results["startup"]
+        print(f"[+] run.py start-up : imports {startup['import_ms']:.1f}ms, "
+              f"process {startup['process_ms']:.1f}ms", file=sys.stderr)
+        for item in startup["slowest"][:5]:
+            print(f"    {item['module']:<24} {item['ms']:.1f}ms", file=sys.stderr)
+    else:
+        results = run_benchmark(sorted(args.matches), args.events, args.seed)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"[+] Results written to {args.output}", file=sys.stderr)
+
+    heavy = results.get("startup", {}).get("heavy_modules")
+    if heavy:
+        print(f"[-] Heavy modules imported at start-up: {', '.join(heavy)}", file=sys.stderr)
+        sys.exit(1)
+    if baseline and compare(results, baseline):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
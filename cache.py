@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+cache.py - persistent on-disk HTTP cache for BallAlysis
+
+The StatsBomb open data files almost never change, so every file we
+download is kept on disk and re-used on the next run.
+
+Layout of the cache directory:
+    blobs/ab/abcdef...   -> raw file content, named by its sha256 hash
+    index/<url hash>.json -> small entry with url, blob hash, ETag,
+                             Last-Modified and the time of the last check
+
+Entries younger than `max_age` seconds are served straight from disk,
+older ones are revalidated with a conditional request (If-None-Match /
+If-Modified-Since) so an unchanged file costs a 304 and no download.
+
+MemoryCache is the in-process layer on top of it : parsed match tables
+are kept in memory under a byte budget, least recently used first out,
+with an optional time to live.
+
+Author: Tarik Ataia
+License: Free - Public - Open Source
+Version: 1.0
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+# Default cache location, can be overridden with the BALLALYSIS_CACHE
+# environment variable or the `cache_dir` argument of StatsAnalyzer
+DEFAULT_CACHE_DIR = os.environ.get(
+    "BALLALYSIS_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "ballalysis"),
+)
+
+# one day : the open data repo is updated a few times per year at most
+DEFAULT_MAX_AGE = 24 * 60 * 60
+
+# memory budget of the in-process cache of parsed matches
+DEFAULT_MEMORY_BUDGET = 256 * 1024 * 1024
+
+
+def atomic_write(path, data):
+    """
+    Write bytes to `path` through a temp file of the same directory and a
+    rename, so a crash never leaves a half written file behind (the temp
+    file is removed on failure).
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def atomic_write_json(path, value):
+    """Write `value` as JSON to `path` atomically, see atomic_write."""
+    atomic_write(path, json.dumps(value).encode("utf-8"))
+
+
+def url_key(url):
+    """Return the sha256 hex digest used to name the index entry of a url."""
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+
+class HTTPCache:
+    """
+    Content-addressed on-disk cache with ETag / Last-Modified metadata
+    and hit / miss counters.
+    """
+    def __init__(self, directory=DEFAULT_CACHE_DIR, offline=False, max_age=DEFAULT_MAX_AGE):
+        self.directory = directory
+        self.offline = offline
+        self.max_age = max_age
+        self.blobs_dir = os.path.join(directory, "blobs")
+        self.index_dir = os.path.join(directory, "index")
+        os.makedirs(self.blobs_dir, exist_ok=True)
+        os.makedirs(self.index_dir, exist_ok=True)
+        # counters are shared between threads, so guard them with a lock
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.not_modified = 0
+
+    # ---- index entries ----
+
+    def _entry_path(self, url):
+        return os.path.join(self.index_dir, url_key(url) + ".json")
+
+    def lookup(self, url):
+        """
+        Return the cache entry for `url` or None if it is not cached
+        (or its blob went missing).
+        """
+        try:
+            with open(self._entry_path(url), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not os.path.exists(self.blob_path(entry["blob"])):
+            return None
+        return entry
+
+    def _write_entry(self, url, entry):
+        atomic_write_json(self._entry_path(url), entry)
+
+    def blob_path(self, digest):
+        """Return the on-disk path of a blob from its sha256 digest."""
+        return os.path.join(self.blobs_dir, digest[:2], digest)
+
+    def is_fresh(self, entry):
+        """True if the entry was checked recently enough to skip revalidation."""
+        return time.time() - entry.get("checked_at", 0) < self.max_age
+
+    @staticmethod
+    def conditional_headers(entry):
+        """Build the If-None-Match / If-Modified-Since headers for an entry."""
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    # ---- writing ----
+
+    def store(self, url, chunks, headers):
+        """
+        Save a downloaded body (an iterable of byte chunks) for `url`
+        and return the new entry. The body is hashed while it is written,
+        so big event files never have to sit in memory as one piece.
+        """
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp = tempfile.mkstemp(dir=self.blobs_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in chunks:
+                    if chunk:
+                        f.write(chunk)
+                        digest.update(chunk)
+                        size += len(chunk)
+            blob = digest.hexdigest()
+            path = self.blob_path(blob)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # identical content is stored only once
+            if os.path.exists(path):
+                os.remove(tmp)
+            else:
+                os.replace(tmp, path)
+        except OSError:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+        entry = {
+            "url": url,
+            "blob": blob,
+            "size": size,
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "checked_at": time.time(),
+        }
+        self._write_entry(url, entry)
+        return entry
+
+    def touch(self, url, entry, headers):
+        """
+        Mark an entry as re-validated after a 304 Not Modified answer,
+        picking up a new ETag / Last-Modified if the server sent one.
+        """
+        entry["checked_at"] = time.time()
+        if headers.get("ETag"):
+            entry["etag"] = headers["ETag"]
+        if headers.get("Last-Modified"):
+            entry["last_modified"] = headers["Last-Modified"]
+        self._write_entry(url, entry)
+        return entry
+
+    # ---- counters ----
+
+    def record(self, hit=False, revalidated=False, not_modified=False):
+        """Update the hit / miss counters in a thread safe way."""
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+            if revalidated:
+                self.revalidations += 1
+            if not_modified:
+                self.not_modified += 1
+
+    def stats(self):
+        """Return the cache counters as a dictionary."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "revalidations": self.revalidations,
+                "not_modified": self.not_modified,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+
+def default_sizeof(value):
+    """Size in bytes of a cached value : its `nbytes` when it has one."""
+    size = getattr(value, "nbytes", None)
+    return size if size is not None else 0
+
+
+class MemoryCache:
+    """
+    Thread safe, size bounded LRU cache with an optional time to live
+    and hit / miss / eviction counters.
+    The size of an entry is measured again on every hit, so a value that
+    grows while cached (an EventTable building its DataFrame) is accounted.
+    """
+    def __init__(self, max_bytes=DEFAULT_MEMORY_BUDGET, ttl=None, sizeof=default_sizeof):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.sizeof = sizeof
+        self._lock = threading.Lock()
+        # key -> [value, size, expiry], least recently used first
+        self._entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def _drop(self, key):
+        value, size, expiry = self._entries.pop(key)
+        self.bytes -= size
+
+    def _evict(self):
+        # oldest entries out until the budget is met
+        while self.bytes > self.max_bytes and self._entries:
+            self._drop(next(iter(self._entries)))
+            self.evictions += 1
+
+    def get(self, key, default=None):
+        """Return the cached value (and mark it recently used) or `default`."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] is not None and entry[2] < time.monotonic():
+                self._drop(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self._entries.move_to_end(key)
+            size = self.sizeof(entry[0])
+            self.bytes += size - entry[1]
+            entry[1] = size
+            value = entry[0]
+            self._evict()
+            return value
+
+    def put(self, key, value):
+        """
+        Cache a value, evicting the least recently used entries if the
+        budget is exceeded. A value bigger than the whole budget is not kept.
+        """
+        size = self.sizeof(value)
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            if size > self.max_bytes:
+                return value
+            expiry = time.monotonic() + self.ttl if self.ttl else None
+            self._entries[key] = [value, size, expiry]
+            self.bytes += size
+            self._evict()
+        return value
+
+    def pop(self, key):
+        """Forget a key (no-op if it is not cached)."""
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self):
+        """Return the memory cache counters as a dictionary."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+catalog.py - indexed catalogs of the StatsBomb open data
+
+CompetitionCatalog indexes every competition / season of competitions.json
+by name, id, country, gender and season, with fuzzy name resolution
+("laliga", "premier leage" ...), so any competition is resolved in O(1).
+
+MatchCatalog is built once per competition / season from
+matches/{competition_id}/{season_id}.json and keeps hash indexes so that
+every lookup (fixture, team, match id) is a dictionary access instead of
+a new download and a linear scan of the matches list.
+
+Team names are indexed in lowercase, so user input like "barcelona"
+resolves to "Barcelona".
+
+Author: Tarik Ataia
+License: Free - Public - Open Source
+Version: 1.0
+"""
+
+import difflib
+import json
+import unicodedata
+
+from cache import atomic_write_json
+
+# fields kept from each entry of competitions.json
+COMPETITION_FIELDS = ("competition_id", "season_id", "competition_name", "season_name",
+                      "country_name", "competition_gender")
+
+# fuzzy competition names : minimum similarity, and the lead the best
+# candidate needs over the next one (otherwise the name is ambiguous)
+FUZZY_CUTOFF = 0.8
+FUZZY_MARGIN = 0.05
+
+# fields kept from each match of the matches feed
+MATCH_FIELDS = ("match_id", "match_date", "home_score", "away_score", "last_updated")
+
+
+def compact_match(match):
+    """Keep only what the analyzer needs from one entry of the matches feed."""
+    compact = {field: match.get(field) for field in MATCH_FIELDS}
+    compact["home_team"] = match["home_team"]["home_team_name"]
+    compact["away_team"] = match["away_team"]["away_team_name"]
+    return compact
+
+
+def normalize_name(name):
+    """
+    Lowercase, accent-free, single-spaced form of a name used as index key
+    ("Ligue 1", "ligue  1" and "LIGUE 1" give the same key).
+    """
+    text = unicodedata.normalize("NFKD", str(name))
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = "".join(ch if ch.isalnum() else " " for ch in text.casefold())
+    return " ".join(text.split())
+
+
+def _markers(key):
+    """Numbers and one-letter words of a normalized name ("2 bundesliga" -> {"2"})."""
+    # "s" is what is left of a possessive ("women's" -> "women s")
+    return {token for token in key.split() if token.isdigit() or (len(token) == 1 and token != "s")}
+
+
+class CompetitionCatalog:
+    """
+    Every competition / season of the dataset, indexed by
+    (competition, season), competition id, name, country, gender and season.
+    """
+    def __init__(self, competitions, source=None):
+        # `source` is the cache blob hash of competitions.json
+        self.source = source
+        self.entries = [{field: c.get(field) for field in COMPETITION_FIELDS} for c in competitions]
+
+        self.by_key = {}          # (competition_id, season_id) -> entry
+        self.by_name_season = {}  # (normalized name, season name) -> [entries]
+        self.by_name = {}         # normalized name -> [entries]
+        self.by_competition_id = {}
+        self.by_country = {}
+        self.by_gender = {}
+        self.by_season = {}
+        self.names = {}           # normalized name -> display name
+        for entry in self.entries:
+            key = normalize_name(entry["competition_name"])
+            self.by_key[(entry["competition_id"], entry["season_id"])] = entry
+            self.by_name_season.setdefault((key, entry["season_name"]), []).append(entry)
+            self.by_name.setdefault(key, []).append(entry)
+            self.by_competition_id.setdefault(entry["competition_id"], []).append(entry)
+            self.by_country.setdefault(normalize_name(entry["country_name"]), []).append(entry)
+            self.by_gender.setdefault(entry["competition_gender"], []).append(entry)
+            self.by_season.setdefault(entry["season_name"], []).append(entry)
+            self.names.setdefault(key, entry["competition_name"])
+
+    def __len__(self):
+        return len(self.entries)
+
+    def competitions(self):
+        """Sorted display names of every competition."""
+        return sorted(self.names.values())
+
+    def resolve_name(self, name):
+        """
+        Return the display name of a competition from a possibly
+        misspelled / differently cased name, or None.
+        A competition id (int or digits) is accepted as well.
+        """
+        if isinstance(name, int) or str(name).strip().isdigit():
+            entries = self.by_competition_id.get(int(name))
+            return entries[0]["competition_name"] if entries else None
+        key = normalize_name(name)
+        if key in self.names:
+            return self.names[key]
+        # "laliga" -> "la liga" : compare without spaces, then fuzzy
+        squashed = {k.replace(" ", ""): k for k in self.names}
+        if key.replace(" ", "") in squashed:
+            return self.names[squashed[key.replace(" ", "")]]
+        # close spellings only, never another tier or edition of the
+        # same name ("serie b" is not "serie a", "ligue 2" not "ligue 1")
+        close = [k for k in difflib.get_close_matches(key, list(self.names), n=3, cutoff=FUZZY_CUTOFF)
+                 if _markers(k) == _markers(key)]
+        if not close:
+            return None
+        if len(close) > 1:
+            ratios = [difflib.SequenceMatcher(None, key, k).ratio() for k in close[:2]]
+            if ratios[0] - ratios[1] < FUZZY_MARGIN:
+                # ambiguous : two names are as close, do not pick one
+                return None
+        return self.names[close[0]]
+
+    def find(self, competition, season, gender=None):
+        """
+        Return the entry of `season` ("2018/2019") of `competition`
+        (name, fuzzy name or id), optionally for one gender, or None.
+        """
+        name = self.resolve_name(competition)
+        if name is None:
+            return None
+        for entry in self.by_name_season.get((normalize_name(name), season), []):
+            if gender is None or entry["competition_gender"] == gender:
+                return entry
+        return None
+
+    def get(self, competition_id, season_id):
+        """Return the entry of a (competition_id, season_id) pair or None."""
+        return self.by_key.get((competition_id, season_id))
+
+    def seasons(self, competition, gender=None):
+        """Every season entry of a competition, oldest first."""
+        name = self.resolve_name(competition)
+        if name is None:
+            return []
+        entries = [e for e in self.by_name[normalize_name(name)]
+                   if gender is None or e["competition_gender"] == gender]
+        return sorted(entries, key=lambda e: e["season_name"])
+
+    def filter(self, country=None, gender=None, season=None):
+        """
+        Entries matching every given criterion, starting from the
+        smallest index so no full scan is needed in the common cases.
+        """
+        candidates = []
+        if country is not None:
+            candidates.append(self.by_country.get(normalize_name(country), []))
+        if gender is not None:
+            candidates.append(self.by_gender.get(gender, []))
+        if season is not None:
+            candidates.append(self.by_season.get(season, []))
+        if not candidates:
+            return list(self.entries)
+        smallest = min(candidates, key=len)
+        return [e for e in smallest
+                if (country is None or normalize_name(e["country_name"]) == normalize_name(country))
+                and (gender is None or e["competition_gender"] == gender)
+                and (season is None or e["season_name"] == season)]
+
+
+class MatchCatalog:
+    """
+    Matches of one competition / season with O(1) lookups by
+    fixture (home, away), by team and by match id.
+    """
+    def __init__(self, competition_id, season_id, matches, source=None):
+        self.competition_id = competition_id
+        self.season_id = season_id
+        # `source` identifies the matches file the catalog was built from
+        # (the cache blob hash), used to know when a saved catalog is stale
+        self.source = source
+        self.matches = list(matches)
+
+        self.by_id = {}
+        self.by_fixture = {}
+        self.by_team = {}
+        self.team_names = {}  # lowercase name -> display name
+        self.normalized_teams = {}  # normalized name (see normalize_name) -> display name
+        for match in self.matches:
+            home, away = match["home_team"], match["away_team"]
+            self.by_id[match["match_id"]] = match
+            self.by_fixture.setdefault((home.lower(), away.lower()), []).append(match)
+            for team in (home, away):
+                self.by_team.setdefault(team.lower(), []).append(match)
+                self.team_names.setdefault(team.lower(), team)
+                self.normalized_teams.setdefault(normalize_name(team), team)
+
+    @classmethod
+    def from_feed(cls, competition_id, season_id, data, source=None):
+        """Build the catalog from the raw matches feed (list of dicts)."""
+        return cls(competition_id, season_id, [compact_match(m) for m in data], source)
+
+    def __len__(self):
+        return len(self.matches)
+
+    def teams(self):
+        """Return the sorted display names of every team of the season."""
+        return sorted(self.team_names.values())
+
+    def resolve_team(self, name):
+        """
+        Return the display name of a team or None : case-insensitive, then
+        without accents / punctuation ("atletico-madrid" -> "Atlético Madrid").
+        """
+        return self.team_names.get(name.strip().lower()) or self.normalized_teams.get(normalize_name(name))
+
+    def find(self, home_team, away_team):
+        """Return the first match between home_team and away_team or None."""
+        fixtures = self.by_fixture.get((home_team.lower(), away_team.lower()))
+        return fixtures[0] if fixtures else None
+
+    def meetings(self, team_a, team_b):
+        """Every match between two teams, in both home / away orientations, oldest first."""
+        a, b = team_a.lower(), team_b.lower()
+        matches = self.by_fixture.get((a, b), []) + self.by_fixture.get((b, a), [])
+        return sorted(matches, key=lambda m: (m.get("match_date") or "", m["match_id"]))
+
+    def team_matches(self, team):
+        """Return every match (home or away) of a team."""
+        return self.by_team.get(team.lower(), [])
+
+    def get(self, match_id):
+        """Return the match with this id or None."""
+        return self.by_id.get(match_id)
+
+    # ---- persistence ----
+
+    def to_dict(self):
+        return {
+            "competition_id": self.competition_id,
+            "season_id": self.season_id,
+            "source": self.source,
+            "matches": self.matches,
+        }
+
+    def save(self, path):
+        """Write the catalog as JSON (atomically) next to the cache."""
+        atomic_write_json(path, self.to_dict())
+
+    @classmethod
+    def load(cls, path):
+        """Read a saved catalog, None if it does not exist or is unreadable."""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return cls(data["competition_id"], data["season_id"], data["matches"], data.get("source"))
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+events.py - streaming, field projected parser for StatsBomb event files
+
+An events/{match_id}.json file is a JSON array of 3-5k deeply nested
+event dicts (freeze frames, 360 data ...). Instead of decoding the whole
+file into Python objects, `iter_json_array` decodes one event at a time
+from a file or a response stream, and `EventTable` keeps only the fields
+the analyzers need as compact column arrays :
+
+    categorical fields -> int32 codes + one list of labels per column
+    integer fields     -> int64 values, -1 when missing
+    float fields       -> float32 values, NaN when missing
+
+The table is parsed once and then serves both the match summary and
+the player statistics through `to_frame()`.
+
+Author: Tarik Ataia
+License: Free - Public - Open Source
+Version: 1.0
+"""
+
+import codecs
+import json
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+CATEGORY = "category"
+INTEGER = "int"
+FLOAT = "float"
+
+# projected columns : name -> (path into the nested event, kind)
+FIELDS = {
+    "team": (("team", "name"), CATEGORY),
+    "player_id": (("player", "id"), INTEGER),
+    "player": (("player", "name"), CATEGORY),
+    "event": (("type", "name"), CATEGORY),
+    "outcome": (("shot", "outcome", "name"), CATEGORY),
+    "pass_type": (("pass", "type", "name"), CATEGORY),
+    "card_type": (("foul_committed", "card", "name"), CATEGORY),
+    "pass_outcome": (("pass", "outcome", "name"), CATEGORY),
+    "recipient_id": (("pass", "recipient", "id"), INTEGER),
+    "period": (("period",), INTEGER),
+    "minute": (("minute",), INTEGER),
+    "second": (("second",), INTEGER),
+    "x": (("location", 0), FLOAT),
+    "y": (("location", 1), FLOAT),
+    "pass_end_x": (("pass", "end_location", 0), FLOAT),
+    "pass_end_y": (("pass", "end_location", 1), FLOAT),
+    "shot_end_x": (("shot", "end_location", 0), FLOAT),
+    "shot_end_y": (("shot", "end_location", 1), FLOAT),
+}
+
+# array.array type codes used while the columns are being built
+_ARRAY_CODES = {CATEGORY: "i", INTEGER: "q", FLOAT: "f"}
+_MISSING = {CATEGORY: -1, INTEGER: -1, FLOAT: float("nan")}
+
+CHUNK_SIZE = 64 * 1024
+
+
+def dig(event, path):
+    """
+    Walk a path of dict keys (or list indexes) into a nested event,
+    returning None as soon as a level is missing.
+    """
+    value = event
+    for key in path:
+        if isinstance(key, int):
+            if not isinstance(value, list) or len(value) <= key:
+                return None
+        elif not isinstance(value, dict):
+            return None
+        value = value[key] if isinstance(key, int) else value.get(key)
+    return value
+
+
+def iter_json_array(fp, chunk_size=CHUNK_SIZE):
+    """
+    Yield the elements of a top level JSON array one by one from a binary
+    file object, keeping only one chunk of text and one element in memory.
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    buf = ""
+    pos = 0
+    eof = False
+    started = False
+
+    while True:
+        # skip whitespace and the separators between elements
+        while pos < len(buf) and buf[pos] in " \t\r\n,":
+            pos += 1
+        if pos < len(buf):
+            if not started:
+                if buf[pos] != "[":
+                    raise ValueError("events file is not a JSON array")
+                started = True
+                pos += 1
+                continue
+            if buf[pos] == "]":
+                return
+            try:
+                obj, end = decoder.raw_decode(buf, pos)
+                # a bare number right at the end of the buffer may be cut,
+                # read more first unless the file is finished
+                if end < len(buf) or eof:
+                    yield obj
+                    pos = end
+                    continue
+            except json.JSONDecodeError:
+                # element cut in the middle of the chunk : read more below
+                if eof:
+                    raise
+        elif eof:
+            if started:
+                raise ValueError("unexpected end of events file")
+            return
+
+        # drop what was already decoded and read the next chunk
+        chunk = fp.read(chunk_size)
+        buf = buf[pos:] + utf8.decode(chunk or b"", final=not chunk)
+        pos = 0
+        eof = not chunk
+
+
+class EventTable:
+    """
+    Columnar, field projected view of the events of one match.
+    """
+    def __init__(self, columns, categories):
+        # columns    : dict name -> numpy array (codes or values)
+        # categories : dict name -> list of labels of categorical columns
+        self.columns = columns
+        self.categories = categories
+        self._frame = None
+
+    @classmethod
+    def from_events(cls, events, fields=FIELDS):
+        """
+        Project an iterable of raw events into a table.
+        Events are consumed one by one, so a generator from
+        `iter_json_array` never materializes the whole match.
+        """
+        values = {name: array(_ARRAY_CODES[kind]) for name, (path, kind) in fields.items()}
+        lookups = {name: {} for name, (path, kind) in fields.items() if kind == CATEGORY}
+        specs = [(name, path, kind, values[name], lookups.get(name)) for name, (path, kind) in fields.items()]
+
+        for e in events:
+            if not e:
+                continue
+            for name, path, kind, column, lookup in specs:
+                value = dig(e, path)
+                if value is None:
+                    column.append(_MISSING[kind])
+                elif lookup is not None:
+                    # each distinct label gets the next integer code
+                    code = lookup.get(value)
+                    if code is None:
+                        code = lookup[value] = len(lookup)
+                    column.append(code)
+                else:
+                    column.append(value)
+
+        columns = {name: np.frombuffer(column, dtype=column.typecode).copy() if len(column)
+                   else np.array([], dtype=column.typecode) for name, column in values.items()}
+        categories = {name: list(lookup) for name, lookup in lookups.items()}
+        return cls(columns, categories)
+
+    @classmethod
+    def concat(cls, tables):
+        """
+        Stack the tables of many matches into one table, re-coding the
+        categorical columns on the union of their labels, so a whole
+        season can be aggregated in one vectorized pass.
+        """
+        tables = [t for t in tables if t is not None]
+        if not tables:
+            return cls.from_events([])
+        columns = {}
+        categories = {}
+        for name in tables[0].columns:
+            if name in tables[0].categories:
+                labels = {}
+                parts = []
+                for t in tables:
+                    # codes of this table -> codes of the union (-1 stays -1)
+                    mapping = np.array([labels.setdefault(label, len(labels)) for label in t.categories[name]] + [-1],
+                                       dtype=np.int32)
+                    parts.append(mapping[t.columns[name]])
+                columns[name] = np.concatenate(parts)
+                categories[name] = list(labels)
+            else:
+                columns[name] = np.concatenate([np.asarray(t.columns[name]) for t in tables])
+        return cls(columns, categories)
+
+    def code(self, column, label):
+        """Integer code of a label of a categorical column (-2, never matching, if absent)."""
+        labels = self.categories[column]
+        return labels.index(label) if label in labels else -2
+
+    def __getstate__(self):
+        # only the compact columns travel between processes, never the DataFrame
+        return {"columns": self.columns, "categories": self.categories}
+
+    def __setstate__(self, state):
+        self.__init__(state["columns"], state["categories"])
+
+    def __len__(self):
+        return len(next(iter(self.columns.values()))) if self.columns else 0
+
+    @property
+    def nbytes(self):
+        """
+        Approximate memory used by the columns, their labels and the
+        DataFrame once it is built.
+        """
+        size = sum(column.nbytes for column in self.columns.values())
+        size += sum(len(str(label)) for labels in self.categories.values() for label in labels)
+        if self._frame is not None:
+            size += int(self._frame.memory_usage(index=False).sum())
+        return size
+
+    def to_frame(self):
+        """
+        Return the table as a DataFrame with categorical columns
+        (integer columns become nullable Int64). Built once and re-used.
+        """
+        if self._frame is None:
+            data = {}
+            for name, column in self.columns.items():
+                if name in self.categories:
+                    data[name] = pd.Categorical.from_codes(column, categories=self.categories[name])
+                elif column.dtype.kind == "f":
+                    data[name] = np.asarray(column)
+                else:
+                    data[name] = pd.arrays.IntegerArray(column.astype("int64"), column == -1)
+            self._frame = pd.DataFrame(data)
+        return self._frame
+
+
+def read_events(fp, fields=FIELDS):
+    """Stream-parse an events JSON array from a binary file object into an EventTable."""
+    return EventTable.from_events(iter_json_array(fp), fields)
+
+
+def parse_event_file(path):
+    """
+    Stream-parse an events file from disk or from a local mirror
+    (used by the worker processes).
+    """
+    # imported here : only the worker processes need it
+    from mirror import open_path
+    with open_path(path) as f:
+        return read_events(f)
+
+
+def parse_event_files(paths, workers=None, chunksize=4):
+    """
+    Parse many cached events files on a pool of worker processes.
+    Workers get file paths and send back compact EventTables, results
+    are yielded in the same order as `paths` so the merge is deterministic.
+    """
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(parse_event_file, paths, chunksize=chunksize)
+
+
+def as_frame(events):
+    """
+    Accept raw events (list of dicts), an EventTable or an already
+    flattened DataFrame and return the flattened DataFrame.
+    """
+    if isinstance(events, pd.DataFrame):
+        return events
+    if isinstance(events, EventTable):
+        return events.to_frame()
+    return EventTable.from_events(events).to_frame()
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+instrument.py - per-stage timing and resource metrics for BallAlysis
+
+`Metrics` records, for every named stage of the analyzer (fetch, decode,
+parse, aggregate ...), the number of calls, wall time, CPU time and the
+growth of the peak RSS, plus free counters (bytes downloaded, events
+parsed ...) and gauges read on demand (cache hit rate).
+
+    metrics = Metrics(enabled=True)
+    with metrics.stage("fetch"):
+        ...
+    metrics.add("bytes_downloaded", 1234)
+    metrics.write_jsonl("metrics.jsonl")   # or metrics.to_prometheus()
+
+When disabled, stage() returns one shared no-op context manager and
+add() returns at once, so the instrumentation can stay in the code.
+Stages can also be profiled with cProfile or pyinstrument (optional).
+
+Author: Tarik Ataia
+License: Free - Public - Open Source
+Version: 1.0
+"""
+
+import contextlib
+import cProfile
+import json
+import os
+import pstats
+import threading
+import time
+
+try:
+    import resource  # peak RSS, not available on Windows
+except ImportError:
+    resource = None
+
+try:
+    import pyinstrument  # optional profiler
+except ImportError:
+    pyinstrument = None
+
+PROFILERS = ("cprofile", "pyinstrument")
+
+# shared no-op context manager returned when metrics are disabled
+_NO_STAGE = contextlib.nullcontext()
+
+
+def peak_rss_kb():
+    """Peak resident set size of the process in KB (0 if unknown)."""
+    if resource is None:
+        return 0
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+class _Stage:
+    """Context manager timing one run of a stage."""
+    __slots__ = ("metrics", "name", "wall", "cpu", "rss", "profiler")
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+        self.profiler = None
+
+    def __enter__(self):
+        if self.name in self.metrics.profile_stages or "*" in self.metrics.profile_stages:
+            self.profiler = self.metrics.start_profiler()
+        self.rss = peak_rss_kb()
+        self.cpu = time.thread_time()
+        self.wall = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        wall = time.perf_counter() - self.wall
+        cpu = time.thread_time() - self.cpu
+        rss = peak_rss_kb() - self.rss
+        if self.profiler is not None:
+            self.metrics.stop_profiler(self.name, self.profiler)
+        self.metrics.record(self.name, wall, cpu, rss)
+        return False
+
+
+class Metrics:
+    """
+    Per-stage wall / CPU timings, peak RSS deltas, counters and gauges.
+    """
+    def __init__(self, enabled=False, profiler=None, profile_stages=()):
+        if profiler is not None and profiler not in PROFILERS:
+            raise ValueError(f"profiler must be one of {PROFILERS}")
+        if profiler == "pyinstrument" and pyinstrument is None:
+            raise ValueError("pyinstrument is not installed (pip install pyinstrument)")
+        self.enabled = enabled
+        self.profiler = profiler
+        # stage names to profile, "*" profiles every stage
+        self.profile_stages = set(profile_stages) if profiler else set()
+        self._lock = threading.Lock()
+        self.stages = {}
+        self.counters = {}
+        self.gauges = {}
+        self.profiles = {}
+
+    # ---- recording ----
+
+    def stage(self, name):
+        """Context manager timing the stage `name` (no-op when disabled)."""
+        if not self.enabled:
+            return _NO_STAGE
+        return _Stage(self, name)
+
+    def record(self, name, wall, cpu, rss_kb=0):
+        """Add one run of a stage."""
+        with self._lock:
+            stats = self.stages.get(name)
+            if stats is None:
+                stats = self.stages[name] = {"calls": 0, "wall": 0.0, "cpu": 0.0, "max_wall": 0.0, "rss_kb": 0}
+            stats["calls"] += 1
+            stats["wall"] += wall
+            stats["cpu"] += cpu
+            stats["max_wall"] = max(stats["max_wall"], wall)
+            stats["rss_kb"] += max(rss_kb, 0)
+
+    def add(self, counter, value=1):
+        """Increase a counter (no-op when disabled)."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[counter] = self.counters.get(counter, 0) + value
+
+    def register_gauge(self, name, read):
+        """
+        Register a function returning a number or a dict of numbers,
+        read every time a snapshot is taken (e.g. the cache counters).
+        """
+        self.gauges[name] = read
+
+    def reset(self):
+        with self._lock:
+            self.stages.clear()
+            self.counters.clear()
+            self.profiles.clear()
+
+    # ---- profiling ----
+
+    def start_profiler(self):
+        if self.profiler == "pyinstrument":
+            profiler = pyinstrument.Profiler()
+            profiler.start()
+            return profiler
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # only one cProfile can run at a time on newer Pythons,
+            # a stage running in parallel in another thread is skipped
+            return None
+        return profiler
+
+    def stop_profiler(self, name, profiler):
+        if self.profiler == "pyinstrument":
+            session = profiler.stop()
+            with self._lock:
+                previous = self.profiles.get(name)
+                self.profiles[name] = session if previous is None else \
+                    pyinstrument.session.Session.combine(previous, session)
+            return
+        profiler.disable()
+        with self._lock:
+            if name in self.profiles:
+                self.profiles[name].add(profiler)
+            else:
+                self.profiles[name] = pstats.Stats(profiler)
+
+    def dump_profiles(self, directory):
+        """
+        Write one file per profiled stage : <stage>.prof (cProfile, open
+        with pstats or snakeviz) or <stage>.txt (pyinstrument).
+        """
+        os.makedirs(directory, exist_ok=True)
+        written = []
+        with self._lock:
+            for name, profile in self.profiles.items():
+                if self.profiler == "pyinstrument":
+                    path = os.path.join(directory, f"{name}.txt")
+                    renderer = pyinstrument.renderers.ConsoleRenderer(unicode=True, color=False)
+                    with open(path, "w", encoding="utf-8") as f:
+                        f.write(renderer.render(profile))
+                else:
+                    path = os.path.join(directory, f"{name}.prof")
+                    profile.dump_stats(path)
+                written.append(path)
+        return written
+
+    # ---- export ----
+
+    def snapshot(self):
+        """Return every stage, counter and gauge as a JSON friendly dict."""
+        with self._lock:
+            data = {
+                "time": time.time(),
+                "stages": {name: dict(stats) for name, stats in self.stages.items()},
+                "counters": dict(self.counters),
+            }
+        data["gauges"] = {name: read() for name, read in self.gauges.items()}
+        return data
+
+    def write_jsonl(self, path):
+        """Append the current snapshot as one line of a JSON lines file."""
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(self.snapshot()) + "\n")
+
+    def to_prometheus(self, prefix="ballalysis"):
+        """Return the current snapshot in the Prometheus text format."""
+        snap = self.snapshot()
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{prefix}_{name}{labels} {value}")
+
+        stages = snap["stages"]
+        metric("stage_calls_total", "counter", "Number of runs of a stage.",
+               [(f'{{stage="{n}"}}', s["calls"]) for n, s in stages.items()])
+        metric("stage_wall_seconds_total", "counter", "Wall time spent in a stage.",
+               [(f'{{stage="{n}"}}', s["wall"]) for n, s in stages.items()])
+        metric("stage_cpu_seconds_total", "counter", "CPU time spent in a stage.",
+               [(f'{{stage="{n}"}}', s["cpu"]) for n, s in stages.items()])
+        metric("stage_peak_rss_kilobytes_total", "counter", "Peak RSS growth during a stage.",
+               [(f'{{stage="{n}"}}', s["rss_kb"]) for n, s in stages.items()])
+        for name, value in snap["counters"].items():
+            metric(f"{name}_total", "counter", f"Counter {name}.", [("", value)])
+        for name, value in snap["gauges"].items():
+            values = value.items() if isinstance(value, dict) else [("value", value)]
+            samples = [(f'{{key="{key}"}}', v) for key, v in values if isinstance(v, (int, float))]
+            metric(name, "gauge", f"Gauge {name}.", samples)
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        """Write the Prometheus text format (e.g. for the node exporter textfile collector)."""
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp, path)
+
+    def export(self, path):
+        """Write to `path` : Prometheus text if it ends with .prom, JSON lines otherwise."""
+        if path.endswith(".prom"):
+            self.write_prometheus(path)
+        else:
+            self.write_jsonl(path)
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+mirror.py - local compressed mirror of the StatsBomb open data
+
+Ingests a checkout (or a .zip / .tar.gz archive) of the open-data `data/`
+tree into one pack file of individually compressed JSON files (gzip, or
+zstd when the `zstandard` package is installed) plus an index mapping
+every path to its offset / length in the pack :
+
+    <mirror>/pack.bin     compressed files, one after the other
+    <mirror>/index.json   {"codec": "gzip", "files": {"events/123.json":
+                           [offset, length, size, sha256], ...}}
+
+    python mirror.py ~/open-data/data ~/ballalysis-mirror [--codec zstd]
+
+StatsAnalyzer(base_url="mirror:///home/me/ballalysis-mirror") then reads
+every file from the pack : no network, random access by path (one seek
+and one read per file).
+
+Author: Tarik Ataia
+License: Free - Public - Open Source
+Version: 1.0
+"""
+
+import argparse
+import gzip
+import hashlib
+import io
+import json
+import os
+import sys
+import tarfile
+import tempfile
+import threading
+import time
+import zipfile
+
+try:
+    import zstandard  # optional, better ratio and faster than gzip
+except ImportError:
+    zstandard = None
+
+from cache import atomic_write_json
+
+CODECS = ("gzip", "zstd")
+PACK_FILE = "pack.bin"
+INDEX_FILE = "index.json"
+URL_SCHEME = "mirror://"
+# separates the mirror directory from the data path in a mirror path
+SEPARATOR = "::"
+
+# mirrors opened by this process, by directory (worker processes too)
+_MIRRORS = {}
+_MIRRORS_LOCK = threading.Lock()
+
+
+def mirror_root(base_url):
+    """
+    Return the mirror directory `base_url` points at
+    ("mirror:///path" or a directory holding an index.json), None otherwise.
+    """
+    if not base_url:
+        return None
+    if base_url.startswith(URL_SCHEME):
+        return base_url[len(URL_SCHEME):]
+    if os.path.isfile(os.path.join(base_url, INDEX_FILE)):
+        return base_url
+    return None
+
+
+def get_mirror(root):
+    """Return the (shared) Mirror of a directory."""
+    root = os.path.abspath(root)
+    with _MIRRORS_LOCK:
+        if root not in _MIRRORS:
+            _MIRRORS[root] = Mirror(root)
+        return _MIRRORS[root]
+
+
+def open_path(path):
+    """
+    Open a local file for binary reading : a mirror path
+    ("<mirror>::events/1.json") or a plain file path.
+    """
+    if SEPARATOR in path:
+        root, name = path.split(SEPARATOR, 1)
+        return get_mirror(root).open(name)
+    return open(path, "rb")
+
+
+def path_source(path):
+    """
+    Content identity of a local file : the sha256 of a mirrored file,
+    the blob name (its sha256 too) of a cached one.
+    """
+    if SEPARATOR in path:
+        root, name = path.split(SEPARATOR, 1)
+        return get_mirror(root).source(name)
+    return os.path.basename(path)
+
+
+def compress(data, codec, level=None):
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=level or 10).compress(data)
+    return gzip.compress(data, compresslevel=level or 6, mtime=0)
+
+
+class Mirror:
+    """
+    Read access to a built mirror.
+    """
+    def __init__(self, root):
+        self.root = root
+        self.pack_path = os.path.join(root, PACK_FILE)
+        with open(os.path.join(root, INDEX_FILE), "r", encoding="utf-8") as f:
+            index = json.load(f)
+        self.codec = index["codec"]
+        self.files = index["files"]
+        if self.codec == "zstd" and zstandard is None:
+            raise ValueError("this mirror is zstd compressed : pip install zstandard")
+
+    def __len__(self):
+        return len(self.files)
+
+    def __contains__(self, name):
+        return name in self.files
+
+    def path(self, name):
+        """Mirror path of a data file (see open_path), None if it is not mirrored."""
+        return f"{self.root}{SEPARATOR}{name}" if name in self.files else None
+
+    def source(self, name):
+        """sha256 of the original file, None if it is not mirrored."""
+        entry = self.files.get(name)
+        return entry[3] if entry else None
+
+    def read_compressed(self, name):
+        offset, length, size, digest = self.files[name]
+        with open(self.pack_path, "rb") as f:
+            f.seek(offset)
+            return f.read(length)
+
+    def open(self, name):
+        """
+        Return a binary file object streaming the decompressed file
+        (only the compressed bytes of that one file are read).
+        """
+        data = io.BytesIO(self.read_compressed(name))
+        if self.codec == "zstd":
+            return zstandard.ZstdDecompressor().stream_reader(data, closefd=True)
+        return gzip.GzipFile(fileobj=data, mode="rb")
+
+    def read(self, name):
+        """Return the decompressed content of a file."""
+        with self.open(name) as f:
+            return f.read()
+
+
+# ---- building ----
+
+def data_name(path):
+    """
+    Path of a file relative to the `data/` directory of the open-data
+    tree ("open-data-master/data/events/1.json" -> "events/1.json").
+    """
+    path = path.replace("\\", "/")
+    if path.startswith("data/"):
+        return path[len("data/"):]
+    if "/data/" in path:
+        return path.split("/data/", 1)[1]
+    return path[2:] if path.startswith("./") else path
+
+
+def iter_source(source):
+    """
+    Yield (name, bytes) for every JSON file of a data/ tree : a directory,
+    a .zip or a tar archive (.tar, .tar.gz ...).
+    """
+    if os.path.isdir(source):
+        # a checkout of the whole repo : use its data/ directory
+        if os.path.isdir(os.path.join(source, "data")):
+            source = os.path.join(source, "data")
+        for directory, dirs, files in os.walk(source):
+            dirs.sort()
+            for file_name in sorted(files):
+                if file_name.endswith(".json"):
+                    path = os.path.join(directory, file_name)
+                    with open(path, "rb") as f:
+                        yield os.path.relpath(path, source).replace(os.sep, "/"), f.read()
+    elif zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            for info in archive.infolist():
+                if info.filename.endswith(".json") and not info.is_dir():
+                    yield data_name(info.filename), archive.read(info)
+    elif tarfile.is_tarfile(source):
+        with tarfile.open(source) as archive:
+            for member in archive:
+                if member.isfile() and member.name.endswith(".json"):
+                    yield data_name(member.name), archive.extractfile(member).read()
+    else:
+        raise ValueError(f"{source} is not a directory, a zip or a tar archive")
+
+
+def build_mirror(source, root, codec="gzip", level=None, log=None):
+    """
+    Compress every JSON file of `source` into a new mirror at `root`
+    (replacing an older one). Returns the index.
+    """
+    if codec not in CODECS:
+        raise ValueError(f"codec must be one of {CODECS}")
+    if codec == "zstd" and zstandard is None:
+        raise ValueError("zstd needs the zstandard package (pip install zstandard)")
+    os.makedirs(root, exist_ok=True)
+    files = {}
+    raw_bytes = 0
+    offset = 0
+    fd, tmp = tempfile.mkstemp(dir=root, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as pack:
+            for name, data in iter_source(source):
+                blob = compress(data, codec, level)
+                pack.write(blob)
+                files[name] = [offset, len(blob), len(data), hashlib.sha256(data).hexdigest()]
+                offset += len(blob)
+                raw_bytes += len(data)
+                if log and len(files) % 500 == 0:
+                    log(f"[+] {len(files)} files mirrored ...")
+        os.replace(tmp, os.path.join(root, PACK_FILE))
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+    index = {"codec": codec, "created": time.time(), "raw_bytes": raw_bytes,
+             "packed_bytes": offset, "files": files}
+    atomic_write_json(os.path.join(root, INDEX_FILE), index)
+    # a process re-building the mirror must not keep the old index
+    with _MIRRORS_LOCK:
+        _MIRRORS.pop(os.path.abspath(root), None)
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a local compressed mirror of the StatsBomb open data")
+    parser.add_argument("source", help="open-data checkout, its data/ directory, or a .zip / .tar.gz of it")
+    parser.add_argument("mirror", help="directory of the mirror to build")
+    parser.add_argument("--codec", choices=CODECS, default="zstd" if zstandard else "gzip",
+                        help="compression of every file (default: zstd if installed, else gzip)")
+    parser.add_argument("--level", type=int, help="compression level")
+    args = parser.parse_args()
+
+    def log(message):
+        print(message, file=sys.stderr)
+
+    started = time.perf_counter()
+    try:
+        index = build_mirror(args.source, args.mirror, args.codec, args.level, log)
+    except (OSError, ValueError) as e:
+        log(f"[-] {e}")
+        sys.exit(1)
+    ratio = index["packed_bytes"] / index["raw_bytes"] if index["raw_bytes"] else 0
+    log(f"[+] {len(index['files'])} files, {index['raw_bytes'] / 1e6:.1f} MB -> "
+        f"{index['packed_bytes'] / 1e6:.1f} MB ({ratio:.0%}, {args.codec}) "
+        f"in {time.perf_counter() - started:.1f}s")
+    log(f"[+] Use it with StatsAnalyzer(base_url=\"{URL_SCHEME}{os.path.abspath(args.mirror)}\")")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+network.py - vectorized pass networks for BallAlysis
+
+For every team, the passer -> recipient matrix of its completed passes
+(`pass.recipient`) and the average on-ball position of each player
+(`location` of every event of that player on the ball).
+
+Everything works on the columns of an EventTable with numpy only :
+every (team, player id) pair gets one integer node index
+(np.unique + return_inverse), positions are bincount sums and the
+matrix is one bincount of passer * n + recipient. No Python loop runs
+per event, so the tables of a whole season can be stacked
+(EventTable.concat) and aggregated in the same single pass.
+
+Author: Tarik Ataia
+License: Free - Public - Open Source
+Version: 1.0
+"""
+
+import numpy as np
+import pandas as pd
+
+from events import EventTable
+
+# node key = team index * _TEAM_STRIDE + player id
+_TEAM_STRIDE = 1 << 32
+
+
+class PassNetwork:
+    """
+    Pass network of one team.
+    nodes  : DataFrame, one row per player (player_id, player, x, y,
+             touches, passes, received), in the order of the matrix
+    matrix : int array, matrix[i, j] = completed passes from node i to node j
+    """
+    def __init__(self, team, nodes, matrix):
+        self.team = team
+        self.nodes = nodes
+        self.matrix = matrix
+
+    def edges(self, min_passes=1):
+        """Passer / recipient pairs with at least `min_passes` passes, most frequent first."""
+        passer, recipient = np.nonzero(self.matrix >= max(min_passes, 1))
+        edges = pd.DataFrame({
+            "passer_id": self.nodes["player_id"].to_numpy()[passer],
+            "passer": self.nodes["player"].to_numpy()[passer],
+            "recipient_id": self.nodes["player_id"].to_numpy()[recipient],
+            "recipient": self.nodes["player"].to_numpy()[recipient],
+            "passes": self.matrix[passer, recipient],
+        })
+        return edges.sort_values("passes", ascending=False, kind="stable").reset_index(drop=True)
+
+
+def pass_networks(events):
+    """
+    Build the PassNetwork of every team from an EventTable (one match,
+    or many stacked with EventTable.concat), raw events or a list of
+    EventTables. Returns a dict team name -> PassNetwork.
+    """
+    if isinstance(events, list) and events and isinstance(events[0], EventTable):
+        table = EventTable.concat(events)
+    elif isinstance(events, EventTable):
+        table = events
+    else:
+        table = EventTable.from_events(events)
+    cols = table.columns
+    team = np.asarray(cols["team"], dtype=np.int64)
+    player_id = np.asarray(cols["player_id"], dtype=np.int64)
+    recipient_id = np.asarray(cols["recipient_id"], dtype=np.int64)
+    on_ball = (team >= 0) & (player_id >= 0)
+
+    # completed passes : no pass outcome and a known recipient
+    passes = (on_ball & (np.asarray(cols["event"]) == table.code("event", "Pass"))
+              & (np.asarray(cols["pass_outcome"]) == -1) & (recipient_id >= 0))
+
+    # one node per (team, player), recipients are team mates of the passer
+    passer_key = team * _TEAM_STRIDE + player_id
+    recipient_key = team * _TEAM_STRIDE + recipient_id
+    keys, first, inverse = np.unique(
+        np.concatenate([passer_key[on_ball], recipient_key[passes]]), return_index=True, return_inverse=True)
+    n = len(keys)
+    n_ball = int(on_ball.sum())
+    node = inverse[:n_ball]            # node of every on-ball event
+    received = inverse[n_ball:]        # node of every pass recipient
+    passer = node[passes[on_ball]]     # node of every completed pass
+
+    # average positions over the on-ball events that have a location
+    x = np.asarray(cols["x"], dtype=np.float64)[on_ball]
+    y = np.asarray(cols["y"], dtype=np.float64)[on_ball]
+    located = ~np.isnan(x) & ~np.isnan(y)
+    touches = np.bincount(node[located], minlength=n)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        avg_x = np.bincount(node[located], weights=x[located], minlength=n) / touches
+        avg_y = np.bincount(node[located], weights=y[located], minlength=n) / touches
+    matrix = np.bincount(passer * n + received, minlength=n * n).reshape(n, n)
+
+    # display name of every node from its first on-ball event
+    names = np.asarray(cols["player"])[on_ball]
+    labels = np.array(table.categories["player"] + [""], dtype=object)
+    node_names = np.full(n, "", dtype=object)
+    from_ball = first < n_ball
+    node_names[from_ball] = labels[names[first[from_ball]]]
+    team_labels = table.categories["team"]
+
+    networks = {}
+    node_team = keys // _TEAM_STRIDE
+    for t in np.unique(node_team):
+        members = np.nonzero(node_team == t)[0]
+        sub = matrix[np.ix_(members, members)]
+        nodes = pd.DataFrame({
+            "player_id": (keys[members] % _TEAM_STRIDE).astype(np.int64),
+            "player": [" ".join(str(name).split()[:3]) for name in node_names[members]],
+            "x": avg_x[members].round(1),
+            "y": avg_y[members].round(1),
+            "touches": touches[members],
+            "passes": sub.sum(axis=1),
+            "received": sub.sum(axis=0),
+        })
+        networks[team_labels[t]] = PassNetwork(team_labels[t], nodes, sub)
+    return networks
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+players.py - persistent cross-match player index for BallAlysis
+
+PlayerIndex maps every StatsBomb player id to the matches of that player,
+with the competition, season, team and the PLAYER_METRICS
+counters of each match :
+
+    players.json -> {"players": {"5503": {"name": "Lionel Andrés Messi Cuccittini",
+                                          "matches": {"16029": [11, 4, "Barcelona", 4, 1, 56]}}}}
+
+It grows match by match as matches are analyzed (a match is only added
+once per version of its events file), so "goals of Messi in 2018/2019"
+is answered from the index in milliseconds instead of re-reading every
+events file. Full names are kept and indexed in a normalized form
+(accents removed, case folded, see catalog.normalize_name) : "messi",
+"Lionel Messi" and "lionel andres messi cuccittini" all resolve.
+
+Author: Tarik Ataia
+License: Free - Public - Open Source
+Version: 1.0
+"""
+
+import difflib
+import json
+import os
+import threading
+
+import pandas as pd
+
+from aggregate import player_summary
+from cache import atomic_write
+from catalog import normalize_name
+from events import as_frame
+
+# bump when the file layout changes, an old index is then rebuilt
+SCHEMA_VERSION = 1
+INDEX_FILE = "players.json"
+
+# leading fields of a per-match entry, the metric counters follow
+ENTRY_FIELDS = ["competition_id", "season_id", "team"]
+
+
+class PlayerIndex:
+    """
+    Inverted index player id -> per-match counters, saved as JSON.
+    """
+    def __init__(self, root, player_metrics):
+        self.path = os.path.join(root, INDEX_FILE)
+        self.metrics = [m.name for m in player_metrics]
+        self.player_metrics = list(player_metrics)
+        self._lock = threading.Lock()
+        self.data = self._read()
+        # normalized name token -> player ids, rebuilt in memory
+        self._tokens = {}
+        self._names = {}
+        for player_id, player in self.data["players"].items():
+            self._index_name(int(player_id), player["name"])
+
+    # ---- persistence ----
+
+    def _empty(self):
+        return {"schema": SCHEMA_VERSION, "metrics": self.metrics, "matches": {}, "players": {}}
+
+    def _read(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return self._empty()
+        # counters computed with another metric set cannot be mixed
+        if data.get("schema") != SCHEMA_VERSION or data.get("metrics") != self.metrics:
+            return self._empty()
+        return data
+
+    def save(self):
+        """Write the index as JSON (atomically)."""
+        with self._lock:
+            text = json.dumps(self.data)
+        atomic_write(self.path, text.encode("utf-8"))
+
+    # ---- building ----
+
+    def _index_name(self, player_id, name):
+        key = normalize_name(name)
+        self._names.setdefault(key, set()).add(player_id)
+        for token in key.split():
+            self._tokens.setdefault(token, set()).add(player_id)
+
+    def has(self, match_id, source=None):
+        """True if the match is indexed (from the events file `source` when given)."""
+        entry = self.data["matches"].get(str(match_id))
+        return entry is not None and (source is None or entry.get("source") == source)
+
+    def add_match(self, competition_id, season_id, match_id, events, source=None):
+        """
+        Index the players of one match : `events` is its EventTable (or
+        raw events / flattened DataFrame). `source` identifies the events
+        file version, a match indexed from the same source is skipped.
+        """
+        if self.has(match_id, source):
+            return False
+        df = as_frame(events)
+        stats_df = player_summary(df, self.player_metrics)
+        # full names : the summary table only keeps three words for display
+        full_names = df.dropna(subset=["player_id", "player"]).groupby(
+            "player_id", observed=True, sort=False)["player"].first().astype(object)
+
+        match_key = str(match_id)
+        with self._lock:
+            self._remove_match(match_key)
+            players = []
+            for row in stats_df.to_dict("records"):
+                player_id = int(row["player_id"])
+                name = full_names.get(row["player_id"], row["player"])
+                player = self.data["players"].setdefault(str(player_id), {"name": name, "matches": {}})
+                if player["name"] != name:
+                    player["name"] = name
+                self._index_name(player_id, name)
+                player["matches"][match_key] = [competition_id, season_id, row["team"]] + \
+                    [int(row[metric]) for metric in self.metrics]
+                players.append(player_id)
+            self.data["matches"][match_key] = {"competition_id": competition_id, "season_id": season_id,
+                                               "source": source, "players": players}
+        return True
+
+    def _remove_match(self, match_key):
+        # a revised match replaces its old entries
+        entry = self.data["matches"].pop(match_key, None)
+        if entry is None:
+            return
+        for player_id in entry["players"]:
+            player = self.data["players"].get(str(player_id))
+            if player is not None:
+                player["matches"].pop(match_key, None)
+
+    # ---- queries ----
+
+    def __len__(self):
+        return len(self.data["players"])
+
+    def match_count(self):
+        return len(self.data["matches"])
+
+    def lookup(self, player):
+        """
+        Return the ids of the players matching a name (full or partial,
+        any case, with or without accents) or an id, best guess first.
+        """
+        if isinstance(player, int) or str(player).strip().isdigit():
+            return [int(player)] if str(int(player)) in self.data["players"] else []
+        key = normalize_name(player)
+        if key in self._names:
+            return sorted(self._names[key])
+        # every word of the query is a word of the name ("messi", "lionel messi")
+        tokens = key.split()
+        ids = set.intersection(*(self._tokens.get(token, set()) for token in tokens)) if tokens else set()
+        if ids:
+            # the most capped player first
+            return sorted(ids, key=lambda pid: -len(self.data["players"][str(pid)]["matches"]))
+        # misspelled words ("mesi") : closest known word for each of them
+        candidates = []
+        for token in tokens:
+            close = difflib.get_close_matches(token, list(self._tokens), n=1, cutoff=0.75)
+            if not close:
+                return []
+            candidates.append(self._tokens[close[0]])
+        ids = set.intersection(*candidates) if candidates else set()
+        return sorted(ids, key=lambda pid: -len(self.data["players"][str(pid)]["matches"]))
+
+    def name(self, player_id):
+        player = self.data["players"].get(str(player_id))
+        return player["name"] if player else None
+
+    def matches(self, player_id, seasons=None):
+        """
+        Per-match counters of a player, optionally only for some
+        (competition_id, season_id) pairs. One row per match.
+        """
+        player = self.data["players"].get(str(player_id))
+        columns = ["match_id"] + ENTRY_FIELDS + self.metrics
+        if player is None:
+            return pd.DataFrame(columns=columns)
+        seasons = set(seasons) if seasons is not None else None
+        rows = [[int(match_id)] + entry for match_id, entry in player["matches"].items()
+                if seasons is None or (entry[0], entry[1]) in seasons]
+        return pd.DataFrame(rows, columns=columns).sort_values("match_id").reset_index(drop=True)
+
+    def totals(self, player_id, seasons=None):
+        """
+        Counters of a player summed per competition / season (and team),
+        with the number of matches played.
+        """
+        matches = self.matches(player_id, seasons)
+        keys = ["competition_id", "season_id", "team"]
+        if matches.empty:
+            return pd.DataFrame(columns=keys + ["Matches"] + self.metrics)
+        totals = matches.groupby(keys, sort=True)[self.metrics].sum()
+        totals.insert(0, "Matches", matches.groupby(keys, sort=True).size())
+        return totals.reset_index()
@@ -5,13 +5,19 @@
 # Date: 19.10.2025
 
 # import necessary libraries
+import os
+import sys
+import time
+import json
+import argparse  # for the non-interactive command line options
+import threading  # for the background pre-warm
 
-from analyzer import StatsAnalyzer 
-# Write analyzer module to make the code modular and organized and readable
-# import StatsAnalyzer class from custom analyzer module .
+# NOTE: the analyzer module (and with it pandas / numpy / requests) is
+# NOT imported here : it is imported by new_analyzer() when the analysis
+# starts, or in the background by Prewarm while the banner and the season
+# prompt are shown, so the tool starts instantly.
 # StatsAnalyzer class handles fetching and analyzing football
 # data from StatsBomb Open Data API.
-# As the code will grow, we will add more functionalities to this class.
 
 import banners as bnr  # custom module for displaying banners
 import colorama  # for colored terminal text
@@ -34,9 +40,121 @@ Github Repo :  https://github.com/statsbomb/open-data/tree/master
 BASE_URL = "https://raw.githubusercontent.com/statsbomb/open-data/refs/heads/master/data/"
 
 
+# function to create the analyzer, importing the heavy modules on first use
+def new_analyzer(season, args, **options):
+    '''
+        Import the analyzer module (pandas, requests ...) and return a
+        StatsAnalyzer with the metrics asked on the command line.
+    '''
+    from analyzer import StatsAnalyzer
+    return StatsAnalyzer(base_url=args.base_url, season=season, competition=args.competition,
+                         memory_budget=args.memory_mb * 1024 * 1024,
+                         metrics=make_metrics(args), **options)
+
+
+class Prewarm:
+    '''
+        Background start-up work done while the user reads the banner and
+        picks a season : import the analyzer module, open the HTTP
+        connection and build the competitions catalog from the cache.
+    '''
+    def __init__(self, args):
+        self.args = args
+        self.analyzer = None
+        self.catalog = None
+        # why the pre-warm failed, reported once the prompt needs it
+        self.error = None
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        try:
+            # quiet while the prompt is on screen, errors are reported later
+            analyzer = new_analyzer(None, self.args, quiet=True)
+            self.catalog = analyzer.competition_catalog()
+            if self.catalog is None:
+                self.error = f"competitions.json not available from {self.args.base_url}"
+            self.analyzer = analyzer
+        except Exception as e:
+            # pre-warm is only an optimization, result() builds a new analyzer
+            self.error = f"{type(e).__name__}: {e}"
+            self.analyzer = None
+
+    def _cached_catalog(self):
+        # competitions.json straight from the mirror or the disk cache, with
+        # the light modules only : the prompt does not wait for pandas / requests
+        from cache import HTTPCache
+        from catalog import CompetitionCatalog
+        from mirror import get_mirror, mirror_root
+        try:
+            root = mirror_root(self.args.base_url)
+            if root:
+                data = get_mirror(root).read("competitions.json")
+            else:
+                cache = HTTPCache()
+                entry = cache.lookup(self.args.base_url + "competitions.json")
+                if entry is None:
+                    return None
+                with open(cache.blob_path(entry["blob"]), "rb") as f:
+                    data = f.read()
+            return CompetitionCatalog(json.loads(data))
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def seasons(self, wait=3.0):
+        '''
+            Return the season names of the selected competition without
+            waiting for the pre-warm when competitions.json is cached.
+            Otherwise wait up to `wait` seconds for it, then fall back
+            to the --season of the command line.
+        '''
+        catalog = self.catalog if not self.thread.is_alive() else self._cached_catalog()
+        if catalog is None and self.thread.is_alive():
+            print(Fore.YELLOW + "\n[*] Fetching the competitions catalog ..." + Style.RESET_ALL)
+            self.thread.join(timeout=wait)
+            catalog = self.catalog
+        if catalog is None:
+            if self.error:
+                print(Fore.RED + f"\n[-] Competitions catalog not available: {self.error}" + Style.RESET_ALL)
+                return []
+            print(Fore.YELLOW + f"\n[!] The competitions catalog is still loading, "
+                                f"offering the --season {self.args.season} only." + Style.RESET_ALL)
+            return [self.args.season]
+        return [entry["season_name"] for entry in catalog.seasons(self.args.competition)]
+
+    def result(self, season):
+        '''
+            Wait for the pre-warm and return the ready analyzer
+            for the selected season.
+        '''
+        self.thread.join()
+        if self.error:
+            print(Fore.YELLOW + f"\n[!] Pre-warm failed ({self.error}), retrying ..." + Style.RESET_ALL)
+        analyzer = self.analyzer or new_analyzer(season, self.args)
+        analyzer.select(season=season)
+        analyzer.quiet = False
+        return analyzer
+
+
+# function to print text char by char (typewriter effect)
+def typewriter(text, delay, fast=False, color=""):
+    '''
+        Print `text` one char at a time, waiting `delay` seconds per char.
+        With fast=True the text is printed at once.
+    '''
+    if fast:
+        sys.stdout.write(f"{color}{text}{Style.RESET_ALL}")
+        sys.stdout.flush()
+        return
+    for ch in text:
+        sys.stdout.write(f"{color}{ch}{Style.RESET_ALL}")
+        sys.stdout.flush()
+        time.sleep(delay)
+
+
 # function to display welcome message
-def welcome_message():
-    print(bnr.banners())
+def welcome_message(fast=False):
+    print(bnr.banners(fast=fast))
     print(Fore.CYAN + "\n[*] Welcome to BallAlysis - The Ultimate Football Data Analyzer!" + Style.RESET_ALL)
     print(Fore.GREEN + "\n[*] Developed by Tarik Ataia : [Conda]" + Style.RESET_ALL)
     print(Fore.YELLOW + "\n[*] Let's kick off your football data analysis journey!" + Style.RESET_ALL)
@@ -45,32 +163,31 @@ def welcome_message():
 
 
 # function to get season input from user
-def get_season():
+def get_season(seasons, competition="La Liga"):
 
     '''
         Function to get the season input from the user for analysis.
-        As La Liga is the main focus of this tool and the most liga that has
-        API data, we will provide options for La Liga seasons.
+        `seasons` are the season names of the competition found in the
+        competitions catalog (see Prewarm.seasons).
     '''
     try:
-        print(Fore.CYAN + "\n[+] Available La Liga Seasons for Analysis:" + Style.RESET_ALL)
-        print(Fore.YELLOW + "    1. 2018/2019" + Style.RESET_ALL)
-        print(Fore.YELLOW + "    2. 2019/2020" + Style.RESET_ALL)
+        if not seasons:
+            print(Fore.RED + f"\n[-] No season found for {competition}." + Style.RESET_ALL)
+            return None
+        print(Fore.CYAN + f"\n[+] Available {competition} Seasons for Analysis:" + Style.RESET_ALL)
+        for number, season in enumerate(seasons, 1):
+            print(Fore.YELLOW + f"    {number}. {season}" + Style.RESET_ALL)
         try:
-            print(Fore.YELLOW + "\n[+] Select the season you want to analyze (1 or 2):" + Style.RESET_ALL)
+            print(Fore.YELLOW + f"\n[+] Select the season you want to analyze (1 to {len(seasons)}):" + Style.RESET_ALL)
             # prompt user for season choice
             while True:
                 season_choice = input(Fore.GREEN + "    Your choice: " + Style.RESET_ALL).strip()
-                if season_choice == '1':
-                    selected_season = '2018/2019'
-                    print(f"\n[+] You have selected the {Fore.CYAN}{selected_season}{Style.RESET_ALL} season for analysis.")
-                    return selected_season
-                elif season_choice == '2':
-                    selected_season = '2019/2020'
+                if season_choice.isdigit() and 1 <= int(season_choice) <= len(seasons):
+                    selected_season = seasons[int(season_choice) - 1]
                     print(f"\n[+] You have selected the {Fore.CYAN}{selected_season}{Style.RESET_ALL} season for analysis.")
                     return selected_season
                 else:
-                    print(Fore.RED + "[!] Invalid choice. Please enter 1 or 2." + Style.RESET_ALL)
+                    print(Fore.RED + f"[!] Invalid choice. Please enter a number from 1 to {len(seasons)}." + Style.RESET_ALL)
         # handle value error for invalid input
         except ValueError as e:
             print(Fore.RED + f"\n[!] Invalid input. Please enter a valid number. Error: {e}" + Style.RESET_ALL)
@@ -79,18 +196,435 @@ def get_season():
         print(Fore.RED + f"\n[!] An error occurred while selecting the season: {e}" + Style.RESET_ALL)
         return None
 
+# function to prompt user to select a team from the teams list
+def team_select(teams):
+    '''
+        This function prompts user to select a team from the fetched teams list.
+    '''
+    try:
+        # Prepare for case-insensitive selection:
+        # - Build a lowercase lookup list from the provided 'teams'.
+        teams_l = [t.lower() for t in teams]
+        while True:
+            team_choice = input(Fore.GREEN + "    Your choice: " + Style.RESET_ALL).strip()
+            if team_choice.lower() in teams_l:
+                return teams[teams_l.index(team_choice.lower())]
+            else:
+                print(Fore.RED + "[-] Invalid team selection. Please choose a valid team from the list." + Style.RESET_ALL)
+    except KeyboardInterrupt:
+        print(Fore.RED + "\n[-] User interrupted the team selection. Exiting ..." + Style.RESET_ALL)
+        sys.exit(0)
+
+
+# function to ask for the individual player stats
+def individual_stats_prompt():
+    '''
+        prompt user to continue to individual player stats analysis or exit
+    '''
+    try:
+        while True:
+            choice = input(Fore.GREEN + "\n[+] Do you want to analyze this match individual player stats?  (y/n): " + Style.RESET_ALL).strip().lower()
+            if choice == 'y':
+                return True
+            elif choice == 'n':
+                print(Fore.CYAN + "\n[+] Exiting individual players stats analysis." + Style.RESET_ALL)
+                return False
+            else:
+                print(Fore.RED + "[-] Invalid choice. Please enter 'y' or 'n'." + Style.RESET_ALL)
+
+    except KeyboardInterrupt as e:
+        print(Fore.RED + f"[-] An error occurred in individual stats analysis: {e}" + Style.RESET_ALL)
+        return None
+
+
+# function to display the teams of the season
+def show_teams(teams, fast=False, competition="La Liga"):
+    print(Fore.GREEN + f"\n[+] Teams found in {competition}:\n" + Style.RESET_ALL)
+    for team in teams:
+        sys.stdout.write(f"\n\t{Fore.CYAN}{team}{Style.RESET_ALL}")
+        sys.stdout.flush()
+        if not fast:
+            time.sleep(0.02)
+    print("\n" + "-"*50)
+    print(f"""{Fore.RED}\n\n!--> Note: If the selected match is not found!
+              Try to pick *Barcelona* as they have the most matches
+                on the StatsBomb API\n""")
+
+
+# function to display the match summary table
+def show_match_summary(stats_df, fast=False):
+    # print final score
+    if len(stats_df) == 2:
+        teams = stats_df.index.tolist()
+        score = f"{teams[0]} {stats_df.loc[teams[0], 'Goals']} - {stats_df.loc[teams[1], 'Goals']} {teams[1]}"
+        print(Fore.CYAN + "\n[+] Final Score:" + Style.RESET_ALL, Fore.YELLOW + score + Style.RESET_ALL + "\n")
+    print("*"*70)
+    typewriter("\n[+] Match Summary Table:\n", 0.05, fast, Fore.CYAN)
+    # print the stats dataframe
+    print(stats_df)
+    print(Fore.GREEN + "\n[!] Match analysis completed successfully!" + Style.RESET_ALL)
+
+
+# function to display the individual player stats table
+def show_player_stats(stats_df, fast=False):
+    print("*"*70)
+    typewriter("\n\t\t\t[+] Player Statistics:\n", 0.08, fast, Fore.CYAN)
+    print("\n")
+    print("*"*70)
+    # the player id is kept in the returned table, not on screen
+    print(f"\n{stats_df.drop(columns=['player_id'])}")
+    print(Fore.GREEN + "\n[!] Individual player stats analysis completed successfully!\n" + Style.RESET_ALL)
+    print("*"*70)
+
+
+# function to display a thank you message
+def thank_you_message(fast=False):
+    messages = [
+        "\n[+] Thank you for using Ballalysis - Football Analyzer!",
+        "\n[+] Developed by Tarik Ataia.",
+        "\n[+] Goodbye!"
+    ]
+    if not fast:
+        time.sleep(0.5)
+    for msg in messages:
+        typewriter(msg + "\n", 0.05, fast)
+
+
+# function to run the interactive match analysis
+def interactive_match(analyzer, fast=False):
+    '''
+        Let the user pick a fixture of the season, then display its
+        summary table and, on demand, the individual player stats.
+    '''
+    teams = analyzer.fetch_teams()
+    if not teams:
+        print("[-] Failed to fetch matches data.")
+        return None
+    show_teams(teams, fast, analyzer.competition)
+
+    while True:
+        print(Fore.CYAN + "\n[+] Home Team Name: " + Style.RESET_ALL)
+        home_team = team_select(teams)
+        print(Fore.CYAN + "\n[+] Away Team Name: " + Style.RESET_ALL)
+        away_team = team_select(teams)
+        if home_team != away_team:
+            break
+        print(Fore.RED + "[-] Home and Away teams cannot be the same." + Style.RESET_ALL)
+
+    print(f"\n[+] Selected match: {Fore.CYAN}{home_team}{Style.RESET_ALL} VS {Fore.CYAN}{away_team}{Style.RESET_ALL}")
+    match = analyzer.find_match(home_team, away_team)
+    if match is None:
+        # if no match is found,
+        # inform the user with the matches of the home team
+        print(f"\n[-] {Style.BRIGHT}Match not found on statsbomb database.{Style.RESET_ALL} ")
+        print(f"[+] Available matches of {home_team}:")
+        for m in analyzer.match_catalog().team_matches(home_team):
+            print(f"    {Fore.GREEN}{m['home_team']}{Style.RESET_ALL} VS {Fore.GREEN}{m['away_team']}{Style.RESET_ALL}")
+        return None
+
+    match_id = match["match_id"]
+    print("[+] Fetching events data for the match...")
+    print("*"*70)
+    print(f"\n {Fore.YELLOW}[+] Found match ID:{Style.RESET_ALL} {match_id}")
+    # parsed once, the same table serves both analyzers
+    events = analyzer.load_events(match_id)
+    if events is None:
+        return None
+    analyzer.index_match(match_id, events, save=True)
+    show_match_summary(analyzer.analyze_match_summary(events), fast)
+    if individual_stats_prompt():
+        show_player_stats(analyzer.analyze_player_stats(events), fast)
+        thank_you_message(fast)
+    return events
+
+
+# function to write result tables as a table, JSON or CSV
+def write_output(tables, fmt="table", output=None):
+    '''
+        `tables` maps a name to a DataFrame.
+        table : pandas text tables, json : one JSON document,
+        csv : the tables one after the other, separated by a blank line.
+        The result goes to `output` (a file path) or to stdout.
+    '''
+    parts = []
+    if fmt == "json":
+        document = {}
+        for name, df in tables.items():
+            # team indexed tables become objects, the others lists of rows
+            orient = "records" if df.index.name is None and df.index.dtype.kind == "i" else "index"
+            document[name] = json.loads(df.to_json(orient=orient))
+        parts.append(json.dumps(document, indent=2) + "\n")
+    elif fmt == "csv":
+        for df in tables.values():
+            parts.append(df.to_csv(index=df.index.dtype.kind != "i"))
+    else:
+        for name, df in tables.items():
+            parts.append(f"[+] {name}:\n{df.to_string()}\n")
+    text = "\n".join(parts)
+
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        sys.stdout.write(text)
+        sys.stdout.flush()
+
+
+# function to read the command line options
+def parse_args():
+    '''
+        Without options the tool runs interactively,
+        --season-table or --home/--away run without any prompt.
+    '''
+    parser = argparse.ArgumentParser(description="BallAlysis - Simple Football Data Analyzer")
+    parser.add_argument("--base-url", default=os.environ.get("BALLALYSIS_DATA") or BASE_URL,
+                        help="where the data is read from : the open-data URL (default) or a "
+                             "local mirror built by mirror.py (mirror:///path), also BALLALYSIS_DATA")
+    parser.add_argument("--competition", default="La Liga",
+                        help="competition name (fuzzy) or id, any of competitions.json (default: La Liga)")
+    parser.add_argument("--season", default="2018/2019",
+                        help="season for the non-interactive modes (default: 2018/2019)")
+    parser.add_argument("--list-competitions", action="store_true",
+                        help="print every competition / season of the dataset")
+    parser.add_argument("--season-table", action="store_true",
+                        help="analyze every match of the season and print the league table")
+    parser.add_argument("--incremental", action="store_true",
+                        help="with --season-table : only analyze new or revised matches, "
+                             "the season totals are kept in the cache")
+    parser.add_argument("--pass-network", action="store_true",
+                        help="with --home/--away : add the pass network (players and passer -> recipient pairs) of both teams")
+    parser.add_argument("--timeline", type=int, metavar="MINUTES",
+                        help="with --home/--away : add the team and player counters per period "
+                             "and per bucket of MINUTES minutes, plus the passing momentum")
+    parser.add_argument("--player",
+                        help="print the counters of a player (name or id) per competition / season "
+                             "from the player index, after indexing the selected --season")
+    parser.add_argument("--spatial", metavar="FILE.npz",
+                        help="with --home/--away or --season-table : write the team / player heatmaps "
+                             "and the shot map of the match or the season as numpy arrays")
+    parser.add_argument("--head-to-head", action="store_true",
+                        help="with --home/--away : every meeting of the two teams in every competition "
+                             "and season (either venue) with their summed counters")
+    parser.add_argument("--home", help="home team of the match to analyze (with --away)")
+    parser.add_argument("--away", help="away team of the match to analyze (with --home)")
+    parser.add_argument("--concurrency", type=int, default=8,
+                        help="number of matches downloaded and analyzed at the same time")
+    parser.add_argument("--processes", type=int, default=0,
+                        help="parse the events on this many worker processes (0 = threads only)")
+    parser.add_argument("--chunksize", type=int, default=4,
+                        help="number of matches sent to a worker process at once")
+    parser.add_argument("--serve", action="store_true",
+                        help="run the HTTP/JSON service instead of the interactive mode")
+    parser.add_argument("--host", default="127.0.0.1", help="address the service listens on")
+    parser.add_argument("--port", type=int, default=int(os.environ.get("PORT") or 8000),
+                        help="port the service listens on (default: $PORT or 8000)")
+    parser.add_argument("--workers", type=int, default=8,
+                        help="number of analyses the service runs at the same time")
+    parser.add_argument("--max-pending", type=int, default=64,
+                        help="requests waiting for a worker before the service answers 503")
+    parser.add_argument("--memory-mb", type=int, default=256,
+                        help="memory budget of the parsed matches kept in memory, in MB (0 = off)")
+    parser.add_argument("--fast", action="store_true",
+                        help="no typewriter animations in the interactive mode")
+    parser.add_argument("--format", choices=["table", "json", "csv"], default="table",
+                        help="output format of the non-interactive modes")
+    parser.add_argument("--output", help="write the result to this file instead of stdout")
+    parser.add_argument("--metrics", default=os.environ.get("BALLALYSIS_METRICS"),
+                        help="write per-stage metrics to this file (.prom = Prometheus text, "
+                             "otherwise JSON lines), also read from BALLALYSIS_METRICS")
+    parser.add_argument("--profile", choices=["cprofile", "pyinstrument"],
+                        help="profile the analyzer stages with this profiler")
+    parser.add_argument("--profile-dir", default="profiles",
+                        help="where the per-stage profiles are written (default: profiles)")
+    return parser.parse_args()
+
+
+# function to build the metrics object from the command line options
+def make_metrics(args):
+    '''
+        Metrics are only enabled when they are exported or profiled.
+    '''
+    from instrument import Metrics
+    enabled = bool(args.metrics or args.profile)
+    return Metrics(enabled=enabled, profiler=args.profile, profile_stages=["*"] if args.profile else ())
+
+
+# function to export the metrics at the end of a run
+def export_metrics(args, analyzer):
+    if args.metrics:
+        analyzer.metrics.export(args.metrics)
+    if args.profile:
+        for path in analyzer.metrics.dump_profiles(args.profile_dir):
+            analyzer.log(f"[+] Profile written to {path}", Fore.CYAN)
+
+
+# function to run the non-interactive season mode
+def season_table(args):
+    '''
+        Analyze every match of a season, matches are reported (on stderr)
+        as they complete and the league table is written at the end.
+    '''
+    # the connection pool must be at least as big as the number of workers
+    analyzer = new_analyzer(args.season, args, pool_size=max(10, args.concurrency))
+    if args.incremental:
+        analyzer.log(f"\n[+] Refreshing the {args.competition} {args.season} totals ...", Fore.CYAN)
+        totals = analyzer.refresh_season(concurrency=args.concurrency)
+        if totals is None:
+            return None
+        table = totals.league_table()
+        write_output({"league_table": table, "players": totals.player_table()}, args.format, args.output)
+        export_metrics(args, analyzer)
+        return table
+    analyzer.log(f"\n[+] Analyzing every match of {args.competition} {args.season} ...", Fore.CYAN)
+    table = analyzer.analyze_season(concurrency=args.concurrency, processes=args.processes,
+                                    chunksize=args.chunksize)
+    if table is None:
+        return None
+    write_output({"league_table": table}, args.format, args.output)
+    if args.spatial:
+        analyzer.spatial_report(path=args.spatial, concurrency=args.concurrency)
+        analyzer.log(f"[+] Heatmaps and shot map written to {args.spatial}", Fore.CYAN)
+    export_metrics(args, analyzer)
+    return table
+
+
+# function to run the non-interactive player mode
+def player_report(args):
+    '''
+        Add the matches of the selected season to the player index (only
+        the missing ones are read) and write the player's counters.
+    '''
+    analyzer = new_analyzer(args.season, args, pool_size=max(10, args.concurrency))
+    if analyzer.index_players(concurrency=args.concurrency) is None:
+        return None
+    career = analyzer.player_career(args.player)
+    if career is None:
+        return None
+    write_output({"player": career}, args.format, args.output)
+    export_metrics(args, analyzer)
+    return career
+
+
+def head_to_head_report(args):
+    '''
+        Analyze every meeting of --home and --away in the whole dataset
+        and write the per-match counters and the totals of both teams.
+    '''
+    analyzer = new_analyzer(args.season, args, pool_size=max(10, args.concurrency))
+    tables = analyzer.head_to_head(args.home, args.away, concurrency=args.concurrency)
+    if tables is None:
+        return None
+    if tables["meetings"].empty:
+        analyzer.log(f"[-] {args.home} and {args.away} never met in the dataset.", Fore.RED)
+        return None
+    write_output(tables, args.format, args.output)
+    export_metrics(args, analyzer)
+    return tables
+
+
+# function to run the non-interactive match mode
+def match_report(args):
+    '''
+        Analyze one fixture given on the command line and write its
+        summary and player tables.
+    '''
+    analyzer = new_analyzer(args.season, args)
+    match = analyzer.find_match(args.home, args.away)
+    if match is None:
+        analyzer.log(f"[-] {args.home} VS {args.away} not found on statsbomb database.", Fore.RED)
+        return None
+    events = analyzer.load_events(match["match_id"])
+    if events is None:
+        return None
+    analyzer.index_match(match["match_id"], events, save=True)
+    tables = {
+        "summary": analyzer.analyze_match_summary(events),
+        "players": analyzer.analyze_player_stats(events),
+    }
+    if args.timeline:
+        from timeline import momentum
+        tables["timeline"] = analyzer.analyze_timeline(events, args.timeline).reset_index()
+        tables["player_timeline"] = analyzer.analyze_timeline(events, args.timeline, by="player").reset_index()
+        tables["momentum"] = momentum(analyzer.analyze_timeline(events, args.timeline)).reset_index()
+    if args.spatial:
+        analyzer.spatial_report(events, path=args.spatial)
+        analyzer.log(f"[+] Heatmaps and shot map written to {args.spatial}", Fore.CYAN)
+    if args.pass_network:
+        for team, network in analyzer.analyze_pass_network(events).items():
+            tables[f"pass_network {team}"] = network.nodes
+            tables[f"passes {team}"] = network.edges()
+    write_output(tables, args.format, args.output)
+    export_metrics(args, analyzer)
+    return tables
+
+
+# function to list every competition / season of the dataset
+def list_competitions(args):
+    '''
+        Write the competitions catalog (one row per competition / season).
+    '''
+    import pandas as pd
+    analyzer = new_analyzer(args.season, args)
+    catalog = analyzer.competition_catalog()
+    if catalog is None:
+        return None
+    table = pd.DataFrame(catalog.entries).sort_values(["competition_name", "season_name"], kind="stable")
+    write_output({"competitions": table.reset_index(drop=True)}, args.format, args.output)
+    return table
+
+
+# function to run the long-running HTTP/JSON service
+def serve(args):
+    '''
+        Serve the analyzer over HTTP until interrupted (see service.py).
+    '''
+    import asyncio
+    from service import StatsService
+    analyzer = new_analyzer(args.season, args, pool_size=max(10, args.workers))
+    service = StatsService(analyzer, host=args.host, port=args.port,
+                           workers=args.workers, max_pending=args.max_pending)
+    try:
+        asyncio.run(service.serve_forever())
+    finally:
+        export_metrics(args, analyzer)
+    return service
+
+
 # main execution block
 if __name__ == "__main__":
+    args = parse_args()
+    if args.serve:
+        try:
+            serve(args)
+        except KeyboardInterrupt:
+            print(Fore.RED + "\n[!] Service stopped by user. Exiting ..." + Style.RESET_ALL)
+        exit(0)
+    if args.list_competitions or args.player or args.season_table or (args.home and args.away):
+        try:
+            if args.list_competitions:
+                result = list_competitions(args)
+            elif args.player:
+                result = player_report(args)
+            elif args.head_to_head and not args.season_table:
+                result = head_to_head_report(args)
+            else:
+                result = season_table(args) if args.season_table else match_report(args)
+            exit(0 if result is not None else 1)
+        except KeyboardInterrupt:
+            print(Fore.RED + "\n[!] Process interrupted by user. Exiting ..." + Style.RESET_ALL)
+            exit(0)
+
     try:
-        welcome_message()
-        # this script currently focuses on La Liga only on two seasons:
-        # 2018/2019 and 2019/2020
-        # it can be extended to include more leagues and seasons in the future.
-        # it made simple for project submission purposes.
-        season = get_season()  # call to get selected season by user
+        # heavy imports, connection and catalog warm up in the background
+        prewarm = Prewarm(args)
+        welcome_message(args.fast)
+        # La Liga by default, any competition with --competition :
+        # the seasons offered come from the competitions catalog
+        season = get_season(prewarm.seasons(), args.competition)  # call to get selected season by user
         if season:
-            analyzer = StatsAnalyzer(base_url=BASE_URL, season=season)
-            analyzer.main()
+            analyzer = prewarm.result(season)
+            interactive_match(analyzer, args.fast)
+            export_metrics(args, analyzer)
 
         else:
             print(Fore.RED + "[!] Season selection failed. Exiting ..." + Style.RESET_ALL)
@@ -101,4 +635,4 @@ if __name__ == "__main__":
         exit(0)
     except Exception as e:
         print(Fore.RED + f"\n[!] An unexpected error occurred: {e}" + Style.RESET_ALL)
-        exit(1)
\ No newline at end of file
+        exit(1)
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+service.py - long-running HTTP/JSON service for BallAlysis
+
+One process keeps a StatsAnalyzer warm (pooled connections, on-disk cache,
+catalogs, event store) and answers JSON requests over HTTP/1.1 with
+keep-alive, built on asyncio.start_server (no extra dependency) :
+
+    GET /competitions
+    GET /teams?competition=La Liga&season=2018/2019
+    GET /match?home=Barcelona&away=Real Madrid[&competition=...&season=...]
+    GET /players?home=Barcelona&away=Real Madrid[&competition=...&season=...]
+    GET /season?competition=La Liga&season=2018/2019
+    GET /head_to_head?home=Barcelona&away=Real Madrid   (every competition / season)
+    GET /stats
+
+- answers are kept in memory (`ttl` seconds), a cached match summary
+  costs a dictionary lookup ;
+- identical requests in flight are coalesced (single-flight) : one
+  download and one computation, every caller gets the same answer ;
+- the analysis runs on `workers` threads, at most `max_pending`
+  computations wait for a worker, above that requests get a 503
+  with Retry-After (backpressure) instead of piling up.
+
+Author: Tarik Ataia
+License: Free - Public - Open Source
+Version: 1.0
+"""
+
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, parse_qsl
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+class ServiceError(Exception):
+    """Error answered to the client with an HTTP status."""
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def frame_to_json(df):
+    """Team indexed tables become objects, the others lists of rows."""
+    orient = "records" if df.index.name is None and df.index.dtype.kind == "i" else "index"
+    return json.loads(df.to_json(orient=orient))
+
+
+class StatsService:
+    """
+    asyncio HTTP front-end of one StatsAnalyzer.
+    """
+    def __init__(self, analyzer, host="127.0.0.1", port=8000, workers=8, max_pending=64,
+                 ttl=300, max_entries=1024):
+        self.analyzer = analyzer
+        self.host = host
+        self.port = port
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ballalysis")
+        self.max_pending = max_pending
+        self.ttl = ttl
+        self.max_entries = max_entries
+        # request key -> (expiry time, encoded JSON answer), least recently used first
+        self._answers = OrderedDict()
+        # request key -> future of the computation in flight (single-flight)
+        self._inflight = {}
+        self.counters = {"requests": 0, "cached": 0, "coalesced": 0, "computed": 0,
+                         "rejected": 0, "errors": 0}
+        self.routes = {
+            "/competitions": self.competitions,
+            "/teams": self.teams,
+            "/match": self.match_summary,
+            "/players": self.player_stats,
+            "/season": self.season_table,
+            "/head_to_head": self.head_to_head,
+        }
+        self.server = None
+
+    # ---- analysis (runs on the worker threads) ----
+
+    def season_analyzer(self, params):
+        """Analyzer of the competition / season asked (the analyzer's by default)."""
+        catalog = self.analyzer.competition_catalog()
+        if catalog is None:
+            raise ServiceError(503, "competitions catalog not available")
+        competition = params.get("competition", self.analyzer.competition)
+        season = params.get("season", self.analyzer.season)
+        entry = catalog.find(competition, season)
+        if entry is None:
+            raise ServiceError(404, f"competition not found: {competition} {season}")
+        return self.analyzer.for_season(entry["competition_id"], entry["season_id"])
+
+    @staticmethod
+    def resolved(analyzer):
+        """Competition / season actually answered (names are resolved fuzzily)."""
+        return {"competition": analyzer.competition, "season": analyzer.season}
+
+    def find_events(self, params):
+        """Analyzer and EventTable of the match asked by home / away."""
+        if "home" not in params or "away" not in params:
+            raise ServiceError(400, "home and away are required")
+        analyzer = self.season_analyzer(params)
+        catalog = analyzer.match_catalog()
+        if catalog is None:
+            raise ServiceError(503, "matches not available")
+        home, away = catalog.resolve_team(params["home"]), catalog.resolve_team(params["away"])
+        match = catalog.find(home, away) if home and away else None
+        if match is None:
+            raise ServiceError(404, f"match not found: {params['home']} VS {params['away']}")
+        events = analyzer.load_events(match["match_id"])
+        if events is None:
+            raise ServiceError(503, f"events of match {match['match_id']} not available")
+        return analyzer, match, events
+
+    def competitions(self, params):
+        catalog = self.analyzer.competition_catalog()
+        if catalog is None:
+            raise ServiceError(503, "competitions catalog not available")
+        return {"competitions": catalog.entries}
+
+    def teams(self, params):
+        analyzer = self.season_analyzer(params)
+        catalog = analyzer.match_catalog()
+        if catalog is None:
+            raise ServiceError(503, "matches not available")
+        return {**self.resolved(analyzer), "teams": catalog.teams()}
+
+    def match_summary(self, params):
+        analyzer, match, events = self.find_events(params)
+        return {**self.resolved(analyzer), "match": match, "summary": frame_to_json(analyzer.analyze_match_summary(events))}
+
+    def player_stats(self, params):
+        analyzer, match, events = self.find_events(params)
+        return {**self.resolved(analyzer), "match": match, "players": frame_to_json(analyzer.analyze_player_stats(events))}
+
+    def season_table(self, params):
+        analyzer = self.season_analyzer(params)
+        analyzer.quiet = True
+        table = analyzer.analyze_season(verbose=False)
+        if table is None:
+            raise ServiceError(503, "matches not available")
+        return {**self.resolved(analyzer), "league_table": frame_to_json(table)}
+
+    def head_to_head(self, params):
+        if "home" not in params or "away" not in params:
+            raise ServiceError(400, "home and away are required")
+        tables = self.analyzer.head_to_head(params["home"], params["away"])
+        if tables is None:
+            raise ServiceError(503, "competitions not available")
+        if tables["meetings"].empty:
+            raise ServiceError(404, f"no meeting found: {params['home']} VS {params['away']}")
+        return {"meetings": frame_to_json(tables["meetings"]), "totals": frame_to_json(tables["totals"])}
+
+    def stats(self):
+        return {
+            "service": dict(self.counters, inflight=len(self._inflight), answers=len(self._answers)),
+            "cache": self.analyzer.cache_stats(),
+            "memory": self.analyzer.memory_stats(),
+        }
+
+    # ---- caching and coalescing ----
+
+    def cached(self, key):
+        answer = self._answers.get(key)
+        if answer is None:
+            return None
+        expiry, body = answer
+        if expiry < time.monotonic():
+            del self._answers[key]
+            return None
+        self._answers.move_to_end(key)
+        return body
+
+    def remember(self, key, body):
+        self._answers[key] = (time.monotonic() + self.ttl, body)
+        self._answers.move_to_end(key)
+        while len(self._answers) > self.max_entries:
+            self._answers.popitem(last=False)
+
+    async def answer(self, path, params):
+        """Return the encoded JSON answer of a request (cached, coalesced or computed)."""
+        handler = self.routes.get(path)
+        if handler is None:
+            raise ServiceError(404, f"unknown path: {path}")
+        key = (path, tuple(sorted(params.items())))
+        body = self.cached(key)
+        if body is not None:
+            self.counters["cached"] += 1
+            return body
+
+        future = self._inflight.get(key)
+        if future is not None:
+            self.counters["coalesced"] += 1
+        else:
+            if len(self._inflight) >= self.max_pending:
+                self.counters["rejected"] += 1
+                raise ServiceError(503, "too many requests in progress, retry later")
+            self.counters["computed"] += 1
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self.executor, self.compute, handler, params)
+            self._inflight[key] = future
+            future.add_done_callback(lambda done: self._finish(key, done))
+        # shield : a client going away must not cancel the shared computation
+        return await asyncio.shield(future)
+
+    def compute(self, handler, params):
+        return json.dumps(handler(params), default=str).encode("utf-8")
+
+    def _finish(self, key, future):
+        self._inflight.pop(key, None)
+        if not future.cancelled() and future.exception() is None:
+            self.remember(key, future.result())
+
+    # ---- HTTP ----
+
+    async def handle(self, reader, writer):
+        """Serve the requests of one (keep-alive) connection."""
+        try:
+            while True:
+                request = await reader.readline()
+                if not request:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                try:
+                    length = int(headers.get("content-length") or 0)
+                    error = "negative Content-Length" if length < 0 else None
+                except ValueError:
+                    length, error = 0, "malformed Content-Length"
+                if length > 0:
+                    await reader.readexactly(length)
+
+                parts = request.decode("latin-1").split()
+                # the body of a bad request can not be skipped : close after the answer
+                keep_alive = (error is None and headers.get("connection", "").lower() != "close"
+                              and parts[-1:] != ["HTTP/1.0"])
+                status, body, extra = await self.dispatch(parts, error)
+                head = [f"HTTP/1.1 {status} {REASONS.get(status, '')}",
+                        "Content-Type: application/json",
+                        f"Content-Length: {len(body)}",
+                        f"Connection: {'keep-alive' if keep_alive else 'close'}"] + extra
+                writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, parts, error=None):
+        """Return (status, body, extra headers) of one request line (`error` : bad headers)."""
+        self.counters["requests"] += 1
+        extra = []
+        try:
+            if error:
+                raise ServiceError(400, error)
+            if len(parts) != 3:
+                raise ServiceError(400, "malformed request line")
+            if parts[0] != "GET":
+                raise ServiceError(405, "only GET is supported")
+            url = urlsplit(parts[1])
+            params = dict(parse_qsl(url.query))
+            if url.path == "/stats":
+                return 200, json.dumps(self.stats()).encode("utf-8"), extra
+            return 200, await self.answer(url.path, params), extra
+        except ServiceError as e:
+            if e.status == 503:
+                extra.append("Retry-After: 1")
+            status, message = e.status, str(e)
+        except Exception as e:
+            status, message = 500, f"{type(e).__name__}: {e}"
+        self.counters["errors"] += 1
+        return status, json.dumps({"error": message}).encode("utf-8"), extra
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle, self.host, self.port)
+        # port=0 picks a free port
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self.server
+
+    async def serve_forever(self):
+        """Warm up (competitions catalog) and serve until cancelled."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self.executor, self.analyzer.competition_catalog)
+        await self.start()
+        self.analyzer.log(f"[+] Serving on http://{self.host}:{self.port}")
+        try:
+            async with self.server:
+                await self.server.serve_forever()
+        finally:
+            self.executor.shutdown(wait=False, cancel_futures=True)
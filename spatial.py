@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+spatial.py - heatmaps and shot maps for BallAlysis
+
+StatsBomb coordinates live on a 120 x 80 pitch. Event locations
+(`location`), pass end points (`pass.end_location`) and shot end points
+(`shot.end_location`) are float32 columns of the EventTable, so
+
+- a heatmap of every team (or player) is ONE bincount of
+  entity * cells + cell over the whole batch, on a configurable grid
+  (24 x 16 cells of 5 x 5 by default) ;
+- a shot map is a set of contiguous arrays (start, end, team, player,
+  outcome code + the outcome labels).
+
+A list of match tables is stacked first (EventTable.concat) so a full
+season is binned in one pass, and `save_npz` writes everything as
+compact numpy arrays for plotting without re-parsing any event.
+
+Author: Tarik Ataia
+License: Free - Public - Open Source
+Version: 1.0
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from events import EventTable
+
+PITCH_LENGTH = 120.0
+PITCH_WIDTH = 80.0
+DEFAULT_BINS = (24, 16)
+
+# where the heatmap points come from : (x column, y column)
+LOCATIONS = {
+    "start": ("x", "y"),
+    "pass_end": ("pass_end_x", "pass_end_y"),
+    "shot_end": ("shot_end_x", "shot_end_y"),
+}
+
+# by    : "team" or "player"
+# labels: team names or player ids, one per heatmap
+# counts: int array (len(labels), bins[0], bins[1]), counts[i, bx, by]
+Heatmaps = namedtuple("Heatmaps", ["by", "labels", "counts"])
+
+
+def as_table(events):
+    """An EventTable from one table, a list of tables (stacked) or raw events."""
+    if isinstance(events, EventTable):
+        return events
+    if isinstance(events, list) and events and isinstance(events[0], EventTable):
+        return EventTable.concat(events)
+    return EventTable.from_events(events)
+
+
+def grid_cells(x, y, bins=DEFAULT_BINS):
+    """
+    Cell number (bx * bins[1] + by) of every point, points on the line
+    go to the edge cells. x / y must not be NaN.
+    """
+    bx = np.clip((x * (bins[0] / PITCH_LENGTH)).astype(np.int64), 0, bins[0] - 1)
+    by = np.clip((y * (bins[1] / PITCH_WIDTH)).astype(np.int64), 0, bins[1] - 1)
+    return bx * bins[1] + by
+
+
+def _entities(table, by):
+    """(labels, entity index of every row, -1 when missing)."""
+    if by == "team":
+        return list(table.categories["team"]), np.asarray(table.columns["team"], dtype=np.int64)
+    if by == "player":
+        player_id = np.asarray(table.columns["player_id"], dtype=np.int64)
+        labels, entity = np.unique(player_id, return_inverse=True)
+        entity = np.where(player_id >= 0, entity, -1)
+        return [int(label) for label in labels], entity
+    raise ValueError("by must be 'team' or 'player'")
+
+
+def heatmaps(events, by="team", bins=DEFAULT_BINS, event=None, location="start"):
+    """
+    Count the events of every team (or player) per grid cell.
+    event    : only count this event type ("Pass", "Shot" ...), all by default
+    location : "start" (event location), "pass_end" or "shot_end"
+    Returns Heatmaps ; entities without any located event are left out.
+    """
+    table = as_table(events)
+    labels, entity = _entities(table, by)
+    x_column, y_column = LOCATIONS[location]
+    x = np.asarray(table.columns[x_column], dtype=np.float64)
+    y = np.asarray(table.columns[y_column], dtype=np.float64)
+    keep = (entity >= 0) & ~np.isnan(x) & ~np.isnan(y)
+    if event is not None:
+        keep &= np.asarray(table.columns["event"]) == table.code("event", event)
+
+    cells = bins[0] * bins[1]
+    flat = entity[keep] * cells + grid_cells(x[keep], y[keep], bins)
+    counts = np.bincount(flat, minlength=len(labels) * cells).reshape(len(labels), bins[0], bins[1])
+    present = counts.sum(axis=(1, 2)) > 0
+    return Heatmaps(by, [label for label, p in zip(labels, present) if p], counts[present].astype(np.int32))
+
+
+def shot_map(events):
+    """
+    Every shot as contiguous arrays : x, y (start), end_x, end_y, team
+    and outcome codes (labels in team_labels / outcome_labels), player_id.
+    """
+    table = as_table(events)
+    cols = table.columns
+    shots = np.asarray(cols["event"]) == table.code("event", "Shot")
+    return {
+        "x": np.asarray(cols["x"], dtype=np.float32)[shots],
+        "y": np.asarray(cols["y"], dtype=np.float32)[shots],
+        "end_x": np.asarray(cols["shot_end_x"], dtype=np.float32)[shots],
+        "end_y": np.asarray(cols["shot_end_y"], dtype=np.float32)[shots],
+        "team": np.asarray(cols["team"], dtype=np.int32)[shots],
+        "player_id": np.asarray(cols["player_id"], dtype=np.int64)[shots],
+        "outcome": np.asarray(cols["outcome"], dtype=np.int32)[shots],
+        "team_labels": np.array(table.categories["team"], dtype=str),
+        "outcome_labels": np.array(table.categories["outcome"], dtype=str),
+    }
+
+
+def spatial_arrays(events, bins=DEFAULT_BINS):
+    """
+    Everything a plot needs, as named numpy arrays : team action and
+    pass end heatmaps, player action heatmaps and the shot map.
+    The events are stacked once and every map is one bincount.
+    """
+    table = as_table(events)
+    arrays = {"bins": np.array(bins), "pitch": np.array([PITCH_LENGTH, PITCH_WIDTH])}
+    for name, by, location in (("team_actions", "team", "start"), ("team_pass_ends", "team", "pass_end"),
+                               ("player_actions", "player", "start")):
+        maps = heatmaps(table, by, bins, location=location)
+        arrays[name] = maps.counts
+        arrays[f"{name}_labels"] = np.array(maps.labels, dtype=str if by == "team" else np.int64)
+    for name, values in shot_map(table).items():
+        arrays[f"shots_{name}"] = values
+    return arrays
+
+
+def save_npz(path, arrays):
+    """Write the arrays of spatial_arrays as one compressed .npz file."""
+    np.savez_compressed(path, **arrays)
+    return path
+
+
+def load_npz(path):
+    """Read a .npz file written by save_npz into a dict of arrays."""
+    with np.load(path) as data:
+        return {name: data[name] for name in data.files}
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+store.py - persistent columnar event store for BallAlysis
+
+Every analyzed match is saved once as a flat numpy structured array
+(one .npy file per match_id) holding the projected event columns of
+events.FIELDS with compact dtypes :
+
+    categorical columns -> int32 codes
+    integer columns     -> int32 (-1 when missing)
+    float columns       -> float32 (NaN when missing)
+
+The labels of the categorical columns live in one manifest per
+competition / season, shared by all its matches, so the codes of every
+match of a season are directly comparable. Later reads memory-map the
+.npy file : reloading a stored match costs milliseconds and no JSON.
+
+    <root>/<competition_id>_<season_id>/manifest.json
+    <root>/<competition_id>_<season_id>/<match_id>.npy
+
+Author: Tarik Ataia
+License: Free - Public - Open Source
+Version: 1.0
+"""
+
+import io
+import json
+import os
+import threading
+
+import numpy as np
+
+from cache import atomic_write, atomic_write_json
+from events import FIELDS, CATEGORY, FLOAT, EventTable
+
+# bump when the on-disk layout changes, old stores are then rebuilt
+SCHEMA_VERSION = 1
+
+_DTYPES = {CATEGORY: "<i4", FLOAT: "<f4"}
+
+
+def record_dtype(fields=FIELDS):
+    """numpy structured dtype used for one stored row."""
+    return np.dtype([(name, _DTYPES.get(kind, "<i4")) for name, (path, kind) in fields.items()])
+
+
+class EventStore:
+    """
+    One directory of stored matches (per competition / season)
+    plus its manifest.
+    """
+    def __init__(self, root, competition_id, season_id, fields=FIELDS):
+        self.directory = os.path.join(root, f"{competition_id}_{season_id}")
+        self.manifest_path = os.path.join(self.directory, "manifest.json")
+        self.fields = fields
+        self.dtype = record_dtype(fields)
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+        self.manifest = self._read_manifest()
+        # label -> code lookups of the shared categories
+        self._codes = {name: {label: code for code, label in enumerate(labels)}
+                       for name, labels in self.manifest["categories"].items()}
+
+    # ---- manifest ----
+
+    def _empty_manifest(self):
+        return {
+            "schema": SCHEMA_VERSION,
+            "fields": list(self.fields),
+            "categories": {name: [] for name, (path, kind) in self.fields.items() if kind == CATEGORY},
+            "matches": {},
+        }
+
+    def _read_manifest(self):
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return self._empty_manifest()
+        # a store written with other columns cannot be re-used
+        if manifest.get("schema") != SCHEMA_VERSION or manifest.get("fields") != list(self.fields):
+            return self._empty_manifest()
+        return manifest
+
+    def _write_manifest(self):
+        atomic_write_json(self.manifest_path, self.manifest)
+
+    # ---- matches ----
+
+    def _match_path(self, match_id):
+        return os.path.join(self.directory, f"{match_id}.npy")
+
+    def has(self, match_id, source=None):
+        """
+        True if the match is stored (and was built from `source`,
+        the cache blob hash of its events file, when given).
+        """
+        entry = self.manifest["matches"].get(str(match_id))
+        if entry is None or not os.path.exists(self._match_path(match_id)):
+            return False
+        return source is None or entry.get("source") == source
+
+    def match_ids(self):
+        """Return the ids of every stored match."""
+        return [int(match_id) for match_id in self.manifest["matches"]]
+
+    def save(self, match_id, table, source=None):
+        """
+        Store the EventTable of a match. Its categorical codes are
+        re-mapped to the labels shared by the whole season.
+        """
+        rows = np.empty(len(table), dtype=self.dtype)
+        with self._lock:
+            for name, (path, kind) in self.fields.items():
+                column = table.columns[name]
+                if kind == CATEGORY:
+                    lookup = self._codes[name]
+                    labels = self.manifest["categories"][name]
+                    # new labels are appended, so existing codes never move
+                    for label in table.categories[name]:
+                        if label not in lookup:
+                            lookup[label] = len(labels)
+                            labels.append(label)
+                    mapping = np.array([lookup[label] for label in table.categories[name]] or [0], dtype="<i4")
+                    column = np.where(column >= 0, mapping[np.maximum(column, 0)], -1)
+                rows[name] = column
+
+            buffer = io.BytesIO()
+            np.save(buffer, rows)
+            atomic_write(self._match_path(match_id), buffer.getbuffer())
+            self.manifest["matches"][str(match_id)] = {"rows": len(rows), "source": source}
+            self._write_manifest()
+
+    def load(self, match_id):
+        """
+        Memory-map a stored match and return it as an EventTable
+        (columns are views into the mapped file), None if not stored.
+        """
+        if not self.has(match_id):
+            return None
+        rows = np.load(self._match_path(match_id), mmap_mode="r")
+        columns = {name: rows[name] for name in self.fields}
+        categories = {name: list(labels) for name, labels in self.manifest["categories"].items()}
+        return EventTable(columns, categories)
+
+    def load_all(self):
+        """Yield (match_id, EventTable) for every stored match of the season."""
+        for match_id in self.match_ids():
+            table = self.load(match_id)
+            if table is not None:
+                yield match_id, table
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+timeline.py - time-bucketed match statistics for BallAlysis
+
+The counters of the match summary (TEAM_METRICS) or of the player table
+(PLAYER_METRICS), per team or per player, per period and per time window
+of `window` minutes (5, 15 ...) :
+
+    timeline(table, window=15)
+                        Shots  Goals  Passes ...
+    team      period minute
+    Barcelona 1      0       3      0     61
+                     15      2      1     58
+    ...
+
+Every event gets a bucket number from its minute / period columns and
+every counter is ONE bincount over (team, period, bucket) indexes, no
+DataFrame is filtered per window. A list of match tables is stacked
+first (EventTable.concat), so a whole season is binned in one pass.
+`momentum` turns a team timeline into a rolling difference with the
+opponent.
+
+Author: Tarik Ataia
+License: Free - Public - Open Source
+Version: 1.0
+"""
+
+import numpy as np
+import pandas as pd
+
+from aggregate import TEAM_METRICS, PLAYER_METRICS, metric_mask
+from events import EventTable, as_frame
+
+
+def _int_column(df, name):
+    """Nullable integer column as int64 numpy values, -1 when missing."""
+    return df[name].to_numpy(dtype="int64", na_value=-1)
+
+
+def timeline(events, window=15, by="team", metrics=None, per_period=True):
+    """
+    Count `metrics` per `by` ("team" or "player"), period and bucket of
+    `window` minutes. `events` is an EventTable, a list of them (a season),
+    raw events or a flattened DataFrame.
+    With per_period=False the periods are merged (period 0 in the index).
+    Returns a DataFrame indexed by (team or player_id, period, minute)
+    where minute is the first minute of the bucket ; player timelines
+    also carry the player name and team. Buckets without any event in
+    the data are left out.
+    """
+    if by not in ("team", "player"):
+        raise ValueError("by must be 'team' or 'player'")
+    if metrics is None:
+        metrics = TEAM_METRICS if by == "team" else PLAYER_METRICS
+    if isinstance(events, list) and events and isinstance(events[0], EventTable):
+        events = EventTable.concat(events)
+    df = as_frame(events)
+
+    minute = _int_column(df, "minute")
+    period = _int_column(df, "period") if per_period else np.zeros(len(df), dtype=np.int64)
+    if by == "team":
+        entity = df["team"].cat.codes.to_numpy().astype(np.int64)
+        labels = np.array(df["team"].cat.categories, dtype=object)
+    else:
+        player_id = _int_column(df, "player_id")
+        labels, entity = np.unique(player_id, return_inverse=True)
+        entity = np.where(player_id >= 0, entity, -1)
+    valid = (entity >= 0) & (minute >= 0) & (period >= 0)
+
+    bucket = minute // window
+    shape = (len(labels), int(period[valid].max(initial=0)) + 1, int(bucket[valid].max(initial=0)) + 1)
+    flat = np.ravel_multi_index((entity[valid], period[valid], bucket[valid]), shape) if valid.any() \
+        else np.array([], dtype=np.int64)
+    size = int(np.prod(shape))
+
+    # one bincount per counter over the (entity, period, bucket) cells
+    counts = np.stack([np.bincount(flat, weights=metric_mask(df, m)[valid], minlength=size)
+                       for m in metrics], axis=-1).reshape(shape + (len(metrics),)).astype(np.int64)
+    # (period, bucket) cells where something happened, for every entity
+    seen = np.bincount(flat, minlength=size).reshape(shape)
+    slots = seen.sum(axis=0) > 0
+    present = seen.sum(axis=(1, 2)) > 0
+
+    ents, periods, buckets = np.nonzero(present[:, None, None] & slots[None, :, :])
+    names = ["team" if by == "team" else "player_id", "period", "minute"]
+    index = pd.MultiIndex.from_arrays([labels[ents], periods, buckets * window], names=names)
+    table = pd.DataFrame(counts[ents, periods, buckets], index=index, columns=[m.name for m in metrics])
+
+    if by == "player":
+        # name and team of every player id, from its first event
+        first = df.assign(player_id=_int_column(df, "player_id"))[valid].groupby(
+            "player_id", sort=False)[["player", "team"]].first()
+        info = first.reindex(labels[ents])
+        table.insert(0, "team", info["team"].astype(object).to_numpy())
+        table.insert(0, "player", [" ".join(str(name).split()[:3]) for name in info["player"].astype(object)])
+    return table
+
+
+def momentum(team_timeline, metric="Passes", span=3):
+    """
+    Rolling momentum of every team : its `metric` minus the opponents' in
+    each bucket, averaged over the last `span` buckets (positive when the
+    team dominates). Meant for the timeline of one match.
+    Returns a DataFrame indexed by (period, minute) with one column per team.
+    """
+    values = team_timeline[metric].unstack("team", fill_value=0).sort_index()
+    # opponents = everybody else of the same bucket
+    difference = 2 * values - values.sum(axis=1).to_numpy()[:, None]
+    rolled = difference.groupby(level="period", group_keys=False).apply(
+        lambda part: part.rolling(span, min_periods=1).mean())
+    rolled.columns.name = None
+    return rolled.round(2)
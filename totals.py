@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+totals.py - persisted, incrementally updated season aggregates
+
+SeasonTotals keeps the running team and player counters of a whole
+competition / season together with the contribution of every match that
+was folded into them and the fingerprint of that match (its last_updated
+stamp from the matches feed, or a hash of its feed entry) :
+
+    totals.diff(catalog.matches)  -> new, changed and removed match ids
+    totals.retract(match_id)      -> subtract the old contribution
+    totals.add(match, summary, players)
+
+so a refresh only analyzes the matches that changed, whatever the size
+of the season. Saved as one JSON file per season :
+
+    <root>/<competition_id>_<season_id>.json
+
+Author: Tarik Ataia
+License: Free - Public - Open Source
+Version: 1.0
+"""
+
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+from aggregate import LEAGUE_COLUMNS, league_rows, league_table
+from cache import atomic_write_json
+
+# bump when the file layout changes, old totals are then rebuilt
+SCHEMA_VERSION = 1
+
+
+def match_fingerprint(match):
+    """
+    Identify the version of a match : its last_updated stamp,
+    or a hash of its feed entry when the feed has none.
+    """
+    if match.get("last_updated"):
+        return match["last_updated"]
+    text = json.dumps(match, sort_keys=True, default=str)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def _add_counters(total, counters, sign):
+    """total[name] += sign * counters[name], dropping counters back at 0."""
+    for name, value in counters.items():
+        value = total.get(name, 0) + sign * value
+        if value:
+            total[name] = value
+        else:
+            total.pop(name, None)
+
+
+class SeasonTotals:
+    """
+    Running team / player counters of one competition / season
+    plus the per-match contributions needed to retract a match.
+    """
+    def __init__(self, root, competition_id, season_id, team_metrics, player_metrics):
+        self.path = os.path.join(root, f"{competition_id}_{season_id}.json")
+        self.competition_id = competition_id
+        self.season_id = season_id
+        # totals computed with another metric set cannot be re-used
+        self.metrics = {
+            "team": [m.name for m in team_metrics],
+            "player": [m.name for m in player_metrics],
+        }
+        self.data = self._read()
+
+    # ---- persistence ----
+
+    def _empty(self):
+        return {
+            "schema": SCHEMA_VERSION,
+            "metrics": self.metrics,
+            "matches": {},  # match id -> {fingerprint, teams, players}
+            "teams": {},    # team -> counters
+            "players": {},  # player id -> {player, team, counters}
+        }
+
+    def _read(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return self._empty()
+        if data.get("schema") != SCHEMA_VERSION or data.get("metrics") != self.metrics:
+            return self._empty()
+        return data
+
+    def save(self):
+        """Write the totals as JSON (atomically)."""
+        atomic_write_json(self.path, self.data)
+
+    # ---- diff ----
+
+    def __len__(self):
+        return len(self.data["matches"])
+
+    def diff(self, matches):
+        """
+        Compare the folded matches with the matches feed (catalog entries).
+        Returns (new, changed, removed) lists of match ids.
+        """
+        folded = self.data["matches"]
+        feed = {str(m["match_id"]): m for m in matches}
+        new = [int(mid) for mid in feed if mid not in folded]
+        changed = [int(mid) for mid, m in feed.items()
+                   if mid in folded and folded[mid]["fingerprint"] != match_fingerprint(m)]
+        removed = [int(mid) for mid in folded if mid not in feed]
+        return new, changed, removed
+
+    # ---- folding ----
+
+    def add(self, match, summary, players):
+        """
+        Fold one match into the totals : `summary` is its match summary
+        table (analyze_match_summary), `players` its player table
+        (analyze_player_stats). A match already folded is replaced.
+        """
+        match_id = str(match["match_id"])
+        if match_id in self.data["matches"]:
+            self.retract(match_id)
+
+        # league results (Played, Won ... GF, GA) + every summary counter
+        teams = {}
+        for row in league_rows(match, summary):
+            team = row.pop("team")
+            counters = {name: int(value) for name, value in row.items()}
+            if team in summary.index:
+                counters.update({name: int(summary.loc[team, name]) for name in summary.columns})
+            teams[team] = counters
+
+        contribution = {}
+        for row in players.to_dict("records"):
+            counters = {name: int(row[name]) for name in self.metrics["player"]}
+            counters["Matches"] = 1
+            contribution[str(int(row["player_id"]))] = {
+                "player": row["player"], "team": row["team"], "counters": counters}
+
+        self.data["matches"][match_id] = {
+            "fingerprint": match_fingerprint(match),
+            "teams": teams,
+            "players": contribution,
+        }
+        for team, counters in teams.items():
+            _add_counters(self.data["teams"].setdefault(team, {}), counters, 1)
+        for player_id, entry in contribution.items():
+            total = self.data["players"].setdefault(player_id, {"counters": {}})
+            # name and team of the latest folded match
+            total["player"], total["team"] = entry["player"], entry["team"]
+            _add_counters(total["counters"], entry["counters"], 1)
+
+    def retract(self, match_id):
+        """Subtract the contribution of a folded match (removed or revised)."""
+        folded = self.data["matches"].pop(str(match_id), None)
+        if folded is None:
+            return
+        for team, counters in folded["teams"].items():
+            total = self.data["teams"].get(team, {})
+            _add_counters(total, counters, -1)
+            if not total:
+                self.data["teams"].pop(team, None)
+        for player_id, entry in folded["players"].items():
+            total = self.data["players"].get(player_id)
+            if total is None:
+                continue
+            _add_counters(total["counters"], entry["counters"], -1)
+            if not total["counters"].get("Matches"):
+                del self.data["players"][player_id]
+
+    # ---- tables ----
+
+    def team_table(self):
+        """Every team counter of the season, one row per team."""
+        columns = ["Played", "Won", "Drawn", "Lost", "GF", "GA"] + self.metrics["team"]
+        table = pd.DataFrame.from_dict(self.data["teams"], orient="index")
+        table = table.reindex(columns=columns).fillna(0).astype(int)
+        return table.sort_index()
+
+    def league_table(self):
+        """The league table (see aggregate.league_table) from the totals."""
+        # counters that stayed at 0 are not stored
+        return league_table([{"team": team, **{c: counters.get(c, 0) for c in LEAGUE_COLUMNS}}
+                             for team, counters in self.data["teams"].items()])
+
+    def player_table(self):
+        """
+        Every player counter of the season (plus the number of matches),
+        sorted like aggregate.player_summary.
+        """
+        columns = ["player_id", "player", "team", "Matches"] + self.metrics["player"]
+        rows = [{"player_id": int(player_id), "player": p["player"], "team": p["team"], **p["counters"]}
+                for player_id, p in self.data["players"].items()]
+        table = pd.DataFrame(rows, columns=columns)
+        counters = columns[3:]
+        table[counters] = table[counters].fillna(0).astype(int)
+        sort = [c for c in ("team", "Goals", "Shots") if c in table.columns]
+        table = table.sort_values(sort, ascending=[True] + [False] * (len(sort) - 1), kind="stable")
+        return table.reset_index(drop=True)